@@ -10,9 +10,18 @@ Feature: Algod
     And I get status after this block
     Then I can get the block info
 
+  Scenario: Block range
+    When I get the status
+    Then I can get the blocks of the last 10 rounds
+
+  Scenario: Restored ledger
+    Given the restored ledger
+    Then the restored accounts and asset should exist
+
   Scenario: Ledger supply
     Then I get the ledger supply
 
+  @memory_budget_16MB
   Scenario: Getting transactions by address
     Given a kmd client
     And wallet information
@@ -29,6 +38,11 @@ Feature: Algod
     And I send the transaction
     Then I can get the transaction by ID
 
+  Scenario: Concurrent queries
+    Given a kmd client
+    And wallet information
+    Then I get account information, the ledger supply, pending transactions and transactions by address concurrently
+
   Scenario: Get pending transactions
     Then I get pending transactions
 
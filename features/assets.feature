@@ -1,3 +1,4 @@
+@memory_budget_16MB
 Feature: Assets
   Background:
     Given an algod client
@@ -184,4 +185,49 @@ Feature: Assets
 
     Examples:
       | total | amount | expected balance  |
-      | 100   | 50     | 100               |
\ No newline at end of file
+      | 100   | 50     | 100               |
+
+  Scenario Outline: Grouped asset acceptance and transfer
+    Given default asset creation transaction with total issuance <total>
+    When I sign the transaction with kmd
+    And I send the kmd-signed transaction
+    Then the transaction should go through
+    When I update the asset index
+    And I create a transaction for a second account, signalling asset acceptance
+    And I add the transaction to the group
+    And I create a transaction transferring <amount> assets from creator to a second account
+    And I add the transaction to the group
+    And I sign the group with kmd
+    And I send the group
+    Then the group should go through
+    And the creator should have <expected balance> assets remaining
+
+    Examples:
+      | total | amount | expected balance |
+      | 100   | 50     | 50               |
+
+  Scenario Outline: Grouped asset acceptance, transfer and freeze
+    Given default asset creation transaction with total issuance <total>
+    When I sign the transaction with kmd
+    And I send the kmd-signed transaction
+    Then the transaction should go through
+    When I update the asset index
+    And I create a transaction for a second account, signalling asset acceptance
+    And I add the transaction to the group
+    And I create a transaction transferring <amount> assets from creator to a second account
+    And I add the transaction to the group
+    And I create a freeze transaction targeting the second account
+    And I add the transaction to the group
+    And I sign the group with kmd
+    And I send the group
+    Then the group should go through
+    And the creator should have <expected balance> assets remaining
+    When I create a transaction transferring <amount> assets from a second account to creator
+    And I sign the transaction with kmd
+    And I send the bogus kmd-signed transaction
+    Then the transaction should not go through
+    And the creator should have <expected balance> assets remaining
+
+    Examples:
+      | total | amount | expected balance |
+      | 100   | 50     | 50               |
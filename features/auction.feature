@@ -4,3 +4,9 @@ Feature: Auction
     And I sign the bid
     And I encode and decode the bid
     Then the bid should still be the same
+
+  @perf
+  Scenario: Encode and decode a batch of bids
+    When I create and sign 1000 bids
+    And I encode and decode the bids
+    Then the bids should still be the same
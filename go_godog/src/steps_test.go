@@ -5,12 +5,14 @@ import (
 	"encoding/base32"
 	"encoding/base64"
 	"encoding/gob"
+	"encoding/json"
 	"flag"
 	"fmt"
 	"io/ioutil"
 	"os"
 	"reflect"
 	"strings"
+	"sync"
 	"testing"
 	"time"
 
@@ -66,6 +68,8 @@ var sugFee models.TransactionFee
 var bid types.Bid
 var sbid types.NoteField
 var oldBid types.NoteField
+var sbids []types.NoteField
+var oldBids []types.NoteField
 var oldPk string
 var newMn string
 var mdk types.MasterDerivationKey
@@ -77,6 +81,8 @@ var votefst uint64
 var votelst uint64
 var votekd uint64
 var num string
+var groupTxns []types.Transaction
+var stxGroup []byte
 
 var assetTestFixture struct {
 	Creator               string
@@ -90,6 +96,15 @@ var assetTestFixture struct {
 	LastTransactionIssued types.Transaction
 }
 
+var ledgerFixture struct {
+	GenesisHash string   `json:"genesis_hash"`
+	Accounts    []string `json:"accounts"`
+	Asset       struct {
+		Index   uint64 `json:"index"`
+		Creator string `json:"creator"`
+	} `json:"asset"`
+}
+
 var opt = godog.Options{
 	Output: colors.Colored(os.Stdout),
 	Format: "progress", // can define default values
@@ -139,6 +154,9 @@ func FeatureContext(s *godog.Suite) {
 	s.Step("I get the status", getStatus)
 	s.Step(`^I get status after this block`, statusAfterBlock)
 	s.Step("I can get the block info", block)
+	s.Step(`I can get the blocks of the last (\d+) rounds`, blockRange)
+	s.Step(`^the restored ledger`, restoredLedger)
+	s.Step(`^the restored accounts and asset should exist`, checkRestored)
 	s.Step("I import the multisig", importMsig)
 	s.Step("the multisig should be in the wallet", msigInWallet)
 	s.Step("I export the multisig", expMsig)
@@ -176,12 +194,16 @@ func FeatureContext(s *godog.Suite) {
 	s.Step(`^I get the ledger supply`, ledger)
 	s.Step(`^I get transactions by address and round`, txnsByAddrRound)
 	s.Step(`^I get pending transactions`, txnsPending)
+	s.Step(`^I get account information, the ledger supply, pending transactions and transactions by address concurrently`, concurrentQueries)
 	s.Step(`^I get the suggested params`, suggestedParams)
 	s.Step(`^I get the suggested fee`, suggestedFee)
 	s.Step(`^the fee in the suggested params should equal the suggested fee`, checkSuggested)
 	s.Step(`^I create a bid`, createBid)
 	s.Step(`^I encode and decode the bid`, encDecBid)
 	s.Step(`^the bid should still be the same`, checkBid)
+	s.Step(`^I create and sign (\d+) bids`, createSignBids)
+	s.Step(`^I encode and decode the bids`, encDecBids)
+	s.Step(`^the bids should still be the same`, checkBids)
 	s.Step(`^I decode the address`, decAddr)
 	s.Step(`^I encode the address`, encAddr)
 	s.Step(`^the address should still be the same`, checkAddr)
@@ -221,9 +243,15 @@ func FeatureContext(s *godog.Suite) {
 	s.Step(`^I create an un-freeze transaction targeting the second account$`, createUnfreezeTransactionTargetingSecondAccount)
 	s.Step(`^default-frozen asset creation transaction with total issuance (\d+)$`, defaultAssetCreateTxnWithDefaultFrozen)
 	s.Step(`^I create a transaction revoking (\d+) assets from a second account to creator$`, createRevocationTransaction)
+	s.Step(`^I add the transaction to the group$`, addTxnToGroup)
+	s.Step(`^I sign the group with kmd$`, signGroupKmd)
+	s.Step(`^I send the group$`, sendGroup)
+	s.Step(`^the group should go through$`, checkGroup)
 
 	s.BeforeScenario(func(interface{}) {
 		stxObj = types.SignedTxn{}
+		groupTxns = nil
+		stxGroup = nil
 		kcl.RenewWalletHandle(handle)
 	})
 }
@@ -491,6 +519,66 @@ func block() error {
 	return err
 }
 
+func restoredLedger() error {
+	path := os.Getenv("LEDGER_FIXTURE")
+	if path == "" {
+		return godog.ErrPending
+	}
+	data, err := ioutil.ReadFile(path)
+	if err != nil {
+		return err
+	}
+	if err = json.Unmarshal(data, &ledgerFixture); err != nil {
+		return err
+	}
+	params, err := acl.SuggestedParams()
+	if err != nil {
+		return err
+	}
+	if base64.StdEncoding.EncodeToString(params.GenesisHash) != ledgerFixture.GenesisHash {
+		return fmt.Errorf("%s was made on a different network", path)
+	}
+	return nil
+}
+
+func checkRestored() error {
+	asset, err := acl.AssetInformation(ledgerFixture.Asset.Index)
+	if err != nil {
+		return err
+	}
+	if asset.Creator != ledgerFixture.Asset.Creator {
+		return fmt.Errorf("asset %d was created by %s, not %s", ledgerFixture.Asset.Index, asset.Creator, ledgerFixture.Asset.Creator)
+	}
+	for _, addr := range ledgerFixture.Accounts {
+		info, err := acl.AccountInformation(addr)
+		if err != nil {
+			return err
+		}
+		holding, ok := info.Assets[ledgerFixture.Asset.Index]
+		if info.Amount == 0 || !ok || holding.Amount == 0 {
+			return fmt.Errorf("fixture account %s has no algos or assets", addr)
+		}
+	}
+	return nil
+}
+
+func blockRange(count int) error {
+	first := uint64(1)
+	if status.LastRound > uint64(count) {
+		first = status.LastRound - uint64(count) + 1
+	}
+	for rnd := first; rnd <= status.LastRound; rnd++ {
+		b, err := acl.Block(rnd)
+		if err != nil {
+			return err
+		}
+		if b.Round != rnd {
+			return fmt.Errorf("got block %d for round %d", b.Round, rnd)
+		}
+	}
+	return nil
+}
+
 func importMsig() error {
 	_, err := kcl.ImportMultisig(handle, msig.Version, msig.Threshold, msig.Pks)
 	return err
@@ -1007,6 +1095,26 @@ func txnsPending() error {
 	return err
 }
 
+func concurrentQueries() error {
+	queries := []func() error{accInfo, ledger, txnsPending, txnsByAddrOnly}
+	errs := make([]error, len(queries))
+	var wg sync.WaitGroup
+	for i, query := range queries {
+		wg.Add(1)
+		go func(i int, query func() error) {
+			defer wg.Done()
+			errs[i] = query()
+		}(i, query)
+	}
+	wg.Wait()
+	for _, err := range errs {
+		if err != nil {
+			return err
+		}
+	}
+	return nil
+}
+
 func suggestedParams() error {
 	var err error
 	sugParams, err = acl.SuggestedParams()
@@ -1059,6 +1167,49 @@ func checkBid() error {
 	return nil
 }
 
+func createSignBids(count int) error {
+	account = crypto.GenerateAccount()
+	addr := account.Address.String()
+	sbids = make([]types.NoteField, count)
+	oldBids = make([]types.NoteField, count)
+	for i := 0; i < count; i++ {
+		b, err := auction.MakeBid(addr, 1, 2, uint64(i+1), addr, 4)
+		if err != nil {
+			return err
+		}
+		signedBytes, err := crypto.SignBid(account.PrivateKey, b)
+		if err != nil {
+			return err
+		}
+		if err = msgpack.Decode(signedBytes, &sbids[i]); err != nil {
+			return err
+		}
+		if err = msgpack.Decode(signedBytes, &oldBids[i]); err != nil {
+			return err
+		}
+	}
+	return nil
+}
+
+func encDecBids() error {
+	for i := range sbids {
+		temp := msgpack.Encode(sbids[i])
+		if err := msgpack.Decode(temp, &sbids[i]); err != nil {
+			return err
+		}
+	}
+	return nil
+}
+
+func checkBids() error {
+	for i := range sbids {
+		if sbids[i] != oldBids[i] {
+			return fmt.Errorf("bid %d should still be the same", i)
+		}
+	}
+	return nil
+}
+
 func decAddr() error {
 	var err error
 	oldPk = pk
@@ -1569,3 +1720,77 @@ func createRevocationTransaction(amount int) error {
 	txn = assetRevokeTxn
 	return err
 }
+
+func addTxnToGroup() error {
+	groupTxns = append(groupTxns, txn)
+	return nil
+}
+
+func signGroupKmd() error {
+	var err error
+	groupTxns, err = transaction.AssignGroupID(groupTxns, "")
+	if err != nil {
+		return err
+	}
+	stxGroup = nil
+	for _, t := range groupTxns {
+		s, err := kcl.SignTransaction(handle, walletPswd, t)
+		if err != nil {
+			return err
+		}
+		stxGroup = append(stxGroup, s.SignedTransaction...)
+	}
+	return nil
+}
+
+func sendGroup() error {
+	tx, err := acl.SendRawTransaction(stxGroup)
+	if err != nil {
+		return err
+	}
+	txid = tx.TxID
+	return nil
+}
+
+// rounds waitForConfirmation waits for a transaction before giving up
+const maxWaitRounds = 10
+
+// waitForConfirmation polls the pending information of txid once a round
+// until it has been confirmed
+func waitForConfirmation(txid string) (models.Transaction, error) {
+	status, err := acl.Status()
+	if err != nil {
+		return models.Transaction{}, err
+	}
+	for rnd := status.LastRound; rnd < status.LastRound+maxWaitRounds; rnd++ {
+		info, err := acl.PendingTransactionInformation(txid)
+		if err != nil {
+			return info, err
+		}
+		if info.ConfirmedRound > 0 {
+			return info, nil
+		}
+		_, err = acl.StatusAfterBlock(rnd)
+		if err != nil {
+			return info, err
+		}
+	}
+	return models.Transaction{}, fmt.Errorf("transaction %s not confirmed after %d rounds", txid, maxWaitRounds)
+}
+
+func checkGroup() error {
+	confirmed, err := waitForConfirmation(crypto.TransactionIDString(groupTxns[0]))
+	if err != nil {
+		return err
+	}
+	for i, t := range groupTxns {
+		info, err := acl.TransactionInformation(t.Sender.String(), crypto.TransactionIDString(t))
+		if err != nil {
+			return err
+		}
+		if info.ConfirmedRound != confirmed.ConfirmedRound {
+			return fmt.Errorf("group transaction %d confirmed in round %d, not %d", i, info.ConfirmedRound, confirmed.ConfirmedRound)
+		}
+	}
+	return nil
+}
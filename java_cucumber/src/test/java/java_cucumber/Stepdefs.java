@@ -12,9 +12,13 @@ import com.algorand.algosdk.crypto.MultisigAddress;
 import com.algorand.algosdk.crypto.MultisigSignature;
 import com.algorand.algosdk.transaction.SignedTransaction;
 import com.algorand.algosdk.transaction.Transaction;
+import com.algorand.algosdk.transaction.TxGroup;
 import com.algorand.algosdk.util.Encoder;
 import com.algorand.algosdk.util.AlgoConverter;
 import com.fasterxml.jackson.core.JsonProcessingException;
+import com.fasterxml.jackson.databind.JsonNode;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import cucumber.api.PendingException;
 import com.algorand.algosdk.auction.Bid;
 import com.algorand.algosdk.auction.SignedBid;
 import com.algorand.algosdk.algod.client.AlgodClient;
@@ -35,9 +39,11 @@ import java.nio.file.Paths;
 import org.junit.Assert;
 import org.threeten.bp.LocalDate;
 
+import java.util.ArrayList;
 import java.util.List;
 import java.util.Set;
 import java.io.BufferedReader;
+import java.io.ByteArrayOutputStream;
 import java.io.FileNotFoundException;
 import java.io.FileReader;
 import java.io.File;
@@ -49,6 +55,10 @@ import java.security.NoSuchAlgorithmException;
 import java.security.spec.InvalidKeySpecException;
 import java.util.Arrays;
 import java.util.Collections;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
 
 
 public class Stepdefs {
@@ -94,6 +104,9 @@ public class Stepdefs {
     Bid bid;
     SignedBid oldBid;
     SignedBid sbid;
+    List<SignedBid> sbids;
+    List<SignedBid> oldBids;
+    JsonNode ledgerFixture;
     BigInteger paramsFee;
     ParticipationPublicKey votepk;
     VRFPublicKey vrfpk;
@@ -110,6 +123,10 @@ public class Stepdefs {
     Transaction.AssetParams expectedParams = null;
     AssetParams queriedParams = new AssetParams();
 
+    /* Atomic groups */
+    List<Transaction> group = new ArrayList<>();
+    byte[] stxGroupBytes;
+
     @When("I create a wallet")
     public void createWallet() throws com.algorand.algosdk.kmd.client.ApiException {
         walletName = "Walletjava";
@@ -351,6 +368,38 @@ public class Stepdefs {
         acl.getBlock(status.getLastRound().add(BigInteger.valueOf(1)));
     }
 
+    @Given("the restored ledger")
+    public void restoredLedger() throws ApiException, IOException{
+        String path = System.getenv("LEDGER_FIXTURE");
+        if (path == null || path.isEmpty()) {
+            throw new PendingException("no ledger snapshot restored (LEDGER_SNAPSHOT)");
+        }
+        ledgerFixture = new ObjectMapper().readTree(new File(path));
+        String genesisHash = java.util.Base64.getEncoder().encodeToString(acl.transactionParams().getGenesishashb64());
+        Assert.assertEquals(ledgerFixture.get("genesis_hash").asText(), genesisHash);
+    }
+
+    @Then("the restored accounts and asset should exist")
+    public void checkRestored() throws ApiException{
+        BigInteger index = BigInteger.valueOf(ledgerFixture.get("asset").get("index").asLong());
+        Assert.assertEquals(ledgerFixture.get("asset").get("creator").asText(), acl.assetInformation(index).getCreator());
+        for (JsonNode addr : ledgerFixture.get("accounts")) {
+            com.algorand.algosdk.algod.client.model.Account info = acl.accountInformation(addr.asText());
+            Assert.assertTrue(info.getAmount().signum() > 0);
+            Assert.assertTrue(info.getHolding(index).getAmount().signum() > 0);
+        }
+    }
+
+    @Then("I can get the blocks of the last {int} rounds")
+    public void blockRange(int count) throws ApiException{
+        BigInteger last = status.getLastRound();
+        BigInteger first = last.subtract(BigInteger.valueOf(count - 1)).max(BigInteger.ONE);
+        for (BigInteger rnd = first; rnd.compareTo(last) <= 0; rnd = rnd.add(BigInteger.ONE)) {
+            Block b = acl.getBlock(rnd);
+            Assert.assertEquals(rnd, b.getRound());
+        }
+    }
+
     @When("I import the multisig")
     public void importMsig() throws com.algorand.algosdk.kmd.client.ApiException{
         ImportMultisigRequest req = new ImportMultisigRequest();
@@ -792,6 +841,26 @@ public class Stepdefs {
         Assert.assertTrue(acl.getPendingTransactions(BigInteger.valueOf(10)).getTruncatedTxns() instanceof TransactionList);
     }
 
+    @Then("I get account information, the ledger supply, pending transactions and transactions by address concurrently")
+    public void concurrentQueries() throws InterruptedException, ExecutionException {
+        ExecutorService pool = Executors.newFixedThreadPool(4);
+        try {
+            Future<com.algorand.algosdk.algod.client.model.Account> info =
+                    pool.submit(() -> acl.accountInformation(accounts.get(0)));
+            Future<Supply> supply = pool.submit(() -> acl.getSupply());
+            Future<PendingTransactions> pending =
+                    pool.submit(() -> acl.getPendingTransactions(BigInteger.valueOf(10)));
+            Future<TransactionList> txns =
+                    pool.submit(() -> acl.transactions(accounts.get(0), null, null, null, null, BigInteger.valueOf(10)));
+            Assert.assertEquals(accounts.get(0), info.get().getAddress());
+            Assert.assertNotNull(supply.get().getTotalMoney());
+            Assert.assertTrue(pending.get().getTruncatedTxns() instanceof TransactionList);
+            Assert.assertTrue(txns.get().getTransactions() instanceof List<?>);
+        } finally {
+            pool.shutdown();
+        }
+    }
+
     @When("I get the suggested params")
     public void suggestedParams() throws ApiException{
         paramsFee = acl.transactionParams().getFee();
@@ -831,6 +900,31 @@ public class Stepdefs {
         Assert.assertTrue(sbid.equals(oldBid));
     }
 
+    @When("I create and sign {int} bids")
+    public void createSignBids(int count) throws NoSuchAlgorithmException {
+        account = new Account();
+        pk = account.getAddress();
+        sbids = new ArrayList<>();
+        oldBids = new ArrayList<>();
+        for (int i = 1; i <= count; i++) {
+            Bid b = new Bid(pk, pk, BigInteger.valueOf(1L), BigInteger.valueOf(2L), BigInteger.valueOf(i), BigInteger.valueOf(4L));
+            sbids.add(account.signBid(b));
+            oldBids.add(account.signBid(b));
+        }
+    }
+
+    @When("I encode and decode the bids")
+    public void encDecBids() throws JsonProcessingException, IOException{
+        for (int i = 0; i < sbids.size(); i++) {
+            sbids.set(i, Encoder.decodeFromMsgPack(Encoder.encodeToMsgPack(sbids.get(i)), SignedBid.class));
+        }
+    }
+
+    @Then("the bids should still be the same")
+    public void checkBids() {
+        Assert.assertEquals(oldBids, sbids);
+    }
+
     @When("I decode the address")
     public void decAddr() throws NoSuchAlgorithmException{
         pk = new Address(address);
@@ -1231,4 +1325,57 @@ public class Stepdefs {
         this.pk = new Address(this.accounts.get(0));
     }
 
+    @When("I add the transaction to the group")
+    public void i_add_the_transaction_to_the_group() {
+        this.group.add(this.txn);
+    }
+
+    @When("I sign the group with kmd")
+    public void i_sign_the_group_with_kmd() throws IOException, com.algorand.algosdk.kmd.client.ApiException {
+        Transaction[] txns = TxGroup.assignGroupID(this.group.toArray(new Transaction[0]));
+        this.group = Arrays.asList(txns);
+        ByteArrayOutputStream out = new ByteArrayOutputStream();
+        for (Transaction tx : txns) {
+            SignTransactionRequest req = new SignTransactionRequest();
+            req.setTransaction(Encoder.encodeToMsgPack(tx));
+            req.setWalletHandleToken(handle);
+            req.setWalletPassword(walletPswd);
+            out.write(kcl.signTransaction(req).getSignedTransaction());
+        }
+        this.stxGroupBytes = out.toByteArray();
+    }
+
+    @When("I send the group")
+    public void i_send_the_group() throws ApiException {
+        txid = acl.rawTransaction(this.stxGroupBytes).getTxId();
+    }
+
+    // polls the pending information of txid once a round until it has
+    // been confirmed, for at most MAX_WAIT_ROUNDS rounds
+    static final int MAX_WAIT_ROUNDS = 10;
+
+    com.algorand.algosdk.algod.client.model.Transaction waitForConfirmation(String txid) throws ApiException {
+        BigInteger round = acl.getStatus().getLastRound();
+        for (int i = 0; i < MAX_WAIT_ROUNDS; i++) {
+            com.algorand.algosdk.algod.client.model.Transaction info =
+                    acl.pendingTransactionInformation(txid);
+            if (info.getRound() != null && info.getRound().signum() > 0) {
+                return info;
+            }
+            acl.waitForBlock(round);
+            round = round.add(BigInteger.ONE);
+        }
+        throw new AssertionError("transaction " + txid + " not confirmed after " + MAX_WAIT_ROUNDS + " rounds");
+    }
+
+    @Then("the group should go through")
+    public void the_group_should_go_through() throws ApiException, InterruptedException {
+        BigInteger round = waitForConfirmation(this.group.get(0).txID()).getRound();
+        for (Transaction tx : this.group) {
+            com.algorand.algosdk.algod.client.model.Transaction info =
+                    acl.transactionInformation(tx.sender.toString(), tx.txID());
+            Assert.assertEquals(round, info.getRound());
+        }
+    }
+
 }
@@ -112,6 +112,35 @@ Then("I can get the block info", async function(){
     assert.deepStrictEqual(true, Number.isInteger(this.block.round));
 })
 
+Given("the restored ledger", async function(){
+    if (!process.env.LEDGER_FIXTURE) {
+        return 'pending'
+    }
+    this.ledgerFixture = JSON.parse(fs.readFileSync(process.env.LEDGER_FIXTURE))
+    let params = await this.acl.getTransactionParams()
+    assert.deepStrictEqual(params.genesishashb64, this.ledgerFixture.genesis_hash)
+})
+
+Then("the restored accounts and asset should exist", async function(){
+    let asset = this.ledgerFixture.asset
+    let info = await this.acl.assetInformation(asset.index)
+    assert.deepStrictEqual(info.creator, asset.creator)
+    for (let addr of this.ledgerFixture.accounts) {
+        let account = await this.acl.accountInformation(addr)
+        assert.deepStrictEqual(true, account.amount > 0)
+        assert.deepStrictEqual(true, account.assets[asset.index].amount > 0)
+    }
+})
+
+Then("I can get the blocks of the last {int} rounds", async function(count){
+    let last = this.status.lastRound
+    let first = Math.max(1, last - count + 1)
+    for (let rnd = first; rnd <= last; rnd++) {
+        let block = await this.acl.block(rnd)
+        assert.deepStrictEqual(rnd, block.round)
+    }
+})
+
 
 Given("payment transaction parameters {int} {int} {int} {string} {string} {string} {int} {string} {string}", function(fee, fv, lv, gh, to, close, amt, gen, note) {
     this.fee = parseInt(fee)
@@ -403,6 +432,20 @@ Then('I get pending transactions', async function () {
 });
 
 
+Then('I get account information, the ledger supply, pending transactions and transactions by address concurrently', async function () {
+    const [info, supply, pending, transactions] = await Promise.all([
+        this.acl.accountInformation(this.accounts[0]),
+        this.acl.ledgerSupply(),
+        this.acl.pendingTransactions(10),
+        this.acl.transactionByAddress(this.accounts[0])
+    ])
+    assert.deepStrictEqual(info.address, this.accounts[0])
+    assert.deepStrictEqual(true, "totalMoney" in supply)
+    assert.deepStrictEqual(true, Object.entries(pending).length === 0 || "truncatedTxns" in pending)
+    assert.deepStrictEqual(true, Object.entries(transactions).length === 0 || "transactions" in transactions)
+});
+
+
 When('I get the suggested params', async function () {
     this.params = await this.acl.getTransactionParams()
     return this.params
@@ -453,6 +496,32 @@ Then('the bid should still be the same', function () {
     assert.deepStrictEqual(algosdk.encodeObj(this.sbid), algosdk.encodeObj(this.oldBid))
 });
 
+When('I create and sign {int} bids', function (count) {
+    let acct = algosdk.generateAccount()
+    this.sbids = []
+    this.oldBids = []
+    for (let i = 1; i <= count; i++) {
+        let bid = {
+            "bidderKey": acct.addr,
+            "bidAmount": 1,
+            "maxPrice": 2,
+            "bidID": i,
+            "auctionKey": acct.addr,
+            "auctionID": 4
+        }
+        this.sbids.push(algosdk.decodeObj(algosdk.signBid(bid, acct.sk)))
+        this.oldBids.push(algosdk.decodeObj(algosdk.signBid(bid, acct.sk)))
+    }
+});
+
+When('I encode and decode the bids', function () {
+    this.sbids = this.sbids.map(sbid => algosdk.decodeObj(algosdk.encodeObj(sbid)))
+});
+
+Then('the bids should still be the same', function () {
+    assert.deepStrictEqual(this.sbids.map(b => algosdk.encodeObj(b)), this.oldBids.map(b => algosdk.encodeObj(b)))
+});
+
 
 When('I decode the address', function () {
     this.old = this.pk
@@ -1204,3 +1273,52 @@ When('I create a transaction revoking {int} assets from a second account to crea
     this.lastRound = this.params.lastRound;
     this.pk = this.assetTestFixture.creator;
 });
+
+When('I add the transaction to the group', function () {
+    if (this.group === undefined) {
+        this.group = [];
+    }
+    this.group.push(this.txn);
+});
+
+When('I sign the group with kmd', async function () {
+    // kmd's signTransaction rebuilds the transaction from its fields and
+    // drops the group ID, so sign locally with each sender's exported key
+    this.group = algosdk.assignGroupID(this.group);
+    let signed = [];
+    for (let tx of this.group) {
+        let key = await this.kcl.exportKey(this.handle, this.wallet_pswd, address.encode(tx.from.publicKey));
+        signed.push(Buffer.from(tx.signTxn(key.private_key)));
+    }
+    this.stxGroup = Buffer.concat(signed);
+});
+
+When('I send the group', async function () {
+    this.txid = await this.acl.sendRawTransaction(this.stxGroup);
+    this.txid = this.txid.txId;
+});
+
+// polls the pending information of txid once a round until it has been
+// confirmed, for at most maxWaitRounds rounds
+const maxWaitRounds = 10
+
+async function waitForConfirmation(acl, txid) {
+    let round = (await acl.status()).lastRound
+    for (let i = 0; i < maxWaitRounds; i++) {
+        let info = await acl.pendingTransactionInformation(txid)
+        if (info.round > 0) {
+            return info
+        }
+        await acl.statusAfterBlock(round)
+        round++
+    }
+    throw new Error("transaction " + txid + " not confirmed after " + maxWaitRounds + " rounds")
+}
+
+Then('the group should go through', async function () {
+    let confirmed = await waitForConfirmation(this.acl, this.group[0].txID());
+    for (let tx of this.group) {
+        let info = await this.acl.transactionInformation(address.encode(tx.from.publicKey), tx.txID());
+        assert.deepStrictEqual(info.round, confirmed.round);
+    }
+});
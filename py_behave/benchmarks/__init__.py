@@ -0,0 +1,2 @@
+"""Standalone benchmarks; run them with `python -m benchmarks.<name>` from
+py_behave."""
@@ -0,0 +1,117 @@
+"""Grouped vs sequential asset flow benchmark.
+
+    python -m benchmarks.asset_groups [--flows 10] [--wallet NAME]
+        [--report FILE]
+
+Runs --flows asset flows against the node in NODE_DIR, each one a second
+account of the kmd wallet opting in to a fresh asset, the creator (the
+wallet's first account) transferring it some and then freezing it. Each
+flow is run once as three transactions, each sent and confirmed before the
+next one as the asset steps do, and once as one atomic group sent and
+confirmed together. The assets are created before timing starts. Reports
+the rounds and wall clock seconds per flow for both, and checks every
+flow's final holding.
+"""
+import argparse
+import sys
+import time
+
+from algosdk import transaction
+from algosdk import wallet
+
+from harness import assets
+from harness import bench
+from harness import clients
+from harness import DEFAULT_WALLET
+from harness.waiter import ConfirmationWaiter
+
+AMOUNT = 50
+
+
+def _create_assets(acl, creator, sk, count, waiter):
+    params = acl.suggested_params()
+    last_round = params["lastRound"]
+    txids = []
+    for i in range(count):
+        txn = transaction.AssetConfigTxn(
+            creator, params["fee"], last_round, last_round + 1000,
+            params["genesishashb64"], total=100, default_frozen=False,
+            unit_name="grp", asset_name="group{}".format(i), manager=creator,
+            reserve=creator, freeze=creator, clawback=creator)
+        txids.append(acl.send_transaction(txn.sign(sk)))
+    return [assets.created(acl, waiter.confirm(acl, txid)) for txid in txids]
+
+
+def _flow(acl, creator, user, index):
+    """The opt-in, transfer and freeze transactions of one flow."""
+    params = acl.suggested_params()
+    args = (params["fee"], params["lastRound"], params["lastRound"] + 1000,
+            params["genesishashb64"])
+    return [
+        transaction.AssetTransferTxn(user, *args, user, 0, index),
+        transaction.AssetTransferTxn(creator, *args, user, AMOUNT, index),
+        transaction.AssetFreezeTxn(creator, *args, index, user, True),
+    ]
+
+
+def _sequential(acl, keys, txns, waiter):
+    for txn in txns:
+        waiter.confirm(acl, acl.send_transaction(txn.sign(keys[txn.sender])))
+
+
+def _grouped(acl, keys, txns, waiter):
+    transaction.assign_group_id(txns)
+    txid = acl.send_transactions([txn.sign(keys[txn.sender])
+                                  for txn in txns])
+    waiter.confirm(acl, txid)
+
+
+def _run(acl, accounts, assets, send):
+    waiter = ConfirmationWaiter.from_env()
+    creator = accounts[0][0]
+    keys = dict(accounts)
+    users = []
+    first = acl.status()["lastRound"]
+    start = time.perf_counter()
+    for i, index in enumerate(assets):
+        user = accounts[1 + i % (len(accounts) - 1)][0]
+        send(acl, keys, _flow(acl, creator, user, index), waiter)
+        users.append(user)
+    seconds = time.perf_counter() - start
+    rounds = acl.status()["lastRound"] - first
+    for user, index in zip(users, assets):
+        holding = acl.account_info(user).get("assets", {}).get(str(index))
+        if not holding or holding["amount"] != AMOUNT or \
+                not holding["frozen"]:
+            sys.exit("asset {} holding of {} is {}".format(index, user,
+                                                           holding))
+    return {"rounds_per_flow": rounds / len(assets),
+            "seconds_per_flow": seconds / len(assets)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--flows", type=int, default=10)
+    parser.add_argument("--wallet", default=DEFAULT_WALLET)
+    parser.add_argument("--report", help="write the report as JSON here")
+    args = parser.parse_args(argv)
+
+    acl = clients.algod_client()
+    w = wallet.Wallet(args.wallet, "", clients.kmd_client())
+    accounts = [(a, w.export_key(a)) for a in w.list_keys()]
+    if len(accounts) < 2:
+        sys.exit("wallet {} needs at least two accounts".format(args.wallet))
+    creator, sk = accounts[0]
+    assets = _create_assets(acl, creator, sk, 2 * args.flows,
+                            ConfirmationWaiter.from_env())
+    report = {"flows": args.flows,
+              "sequential": _run(acl, accounts, assets[:args.flows],
+                                 _sequential),
+              "grouped": _run(acl, accounts, assets[args.flows:], _grouped)}
+    report["speedup"] = report["sequential"]["seconds_per_flow"] / \
+        report["grouped"]["seconds_per_flow"]
+    bench.emit(report, args.report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Auction bid pipeline benchmark.
+
+    python -m benchmarks.bids [--count 100000] [--bidders 100]
+        [--report FILE]
+
+Creates --count bids from --bidders bidders, signs and encodes them, then
+verifies and decodes them again, once the way the auction steps do
+(bid.sign, encoding.msgpack_encode and encoding.msgpack_decode per bid,
+with no verification since the SDK has none) and once with the streaming
+pipeline in harness.bids. The pipeline's encodings are checked to be the
+SDK's, and a bid with a tampered signature to be rejected. Rates are bids
+per second.
+"""
+import argparse
+import base64
+import sys
+
+from nacl.exceptions import BadSignatureError
+
+from algosdk import account
+from algosdk import encoding
+
+from harness import bench
+from harness import bids
+
+
+def sdk_sign(pairs):
+    return [encoding.msgpack_encode(bid.sign(sk)) for sk, bid in pairs]
+
+
+def sdk_decode(encoded):
+    return [encoding.msgpack_decode(blob) for blob in encoded]
+
+
+def tampered(blob):
+    data = bytearray(base64.b64decode(blob))
+    data[-1] ^= 1
+    return base64.b64encode(bytes(data)).decode()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--bidders", type=int, default=100)
+    parser.add_argument("--report", help="write the report as JSON here")
+    args = parser.parse_args(argv)
+
+    bidders = [account.generate_account() for _ in range(args.bidders)]
+    auction_key = account.generate_account()[1]
+    pairs = list(bids.generate(bidders, args.count, auction_key))
+    expected, sdk_sign_rate = bench.rate(args.count, sdk_sign, pairs)
+    encoded, sign_rate = bench.rate(
+        args.count, lambda: list(bids.sign_encoded(
+            bids.generate(bidders, args.count, auction_key))))
+    if encoded != expected:
+        sys.exit("pipeline encodings differ from the SDK's")
+    _, sdk_decode_rate = bench.rate(args.count, sdk_decode, encoded)
+    decoded, verify_rate = bench.rate(
+        args.count, lambda: list(bids.verify_decoded(encoded)))
+    if [encoding.msgpack_encode(b) for b in decoded] != encoded:
+        sys.exit("verified bids differ from the signed ones")
+    try:
+        list(bids.verify_decoded([tampered(encoded[0])]))
+        sys.exit("a tampered bid signature was accepted")
+    except BadSignatureError:
+        pass
+    bench.emit({"bids": args.count, "bidders": args.bidders,
+                "sign_encode": {"sdk": sdk_sign_rate, "pipeline": sign_rate},
+                "decode": {"sdk": sdk_decode_rate,
+                           "pipeline_verified": verify_rate}}, args.report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Block range fetch benchmark.
+
+    python -m benchmarks.blocks [--rounds 1000] [--prefetch 1 4 16]
+        [--cache-dir DIR] [--report FILE]
+
+Fetches the last --rounds blocks of the node in NODE_DIR with
+harness.blocks.BlockFetcher, once per --prefetch window size with an empty
+cache (1 is one serial request per block), then reads the same range again
+from a warm in-memory cache and, with --cache-dir, from a cache that only
+has the blocks on disk. Every block is checked to be the one for its
+round. Rates are blocks per second.
+"""
+import argparse
+import shutil
+import sys
+import tempfile
+
+from harness import bench
+from harness import blocks
+from harness import clients
+
+
+def _read(fetcher, first, last):
+    for rnd, block in enumerate(fetcher.blocks(first, last), first):
+        if block["round"] != rnd:
+            sys.exit("got block {} for round {}".format(block["round"], rnd))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rounds", type=int, default=1000)
+    parser.add_argument("--prefetch", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--cache-dir",
+                        help="also time reads of blocks spilled here")
+    parser.add_argument("--report", help="write the report as JSON here")
+    args = parser.parse_args(argv)
+
+    acl = clients.algod_client()
+    last = acl.status()["lastRound"]
+    first = max(1, last - args.rounds + 1)
+    count = last - first + 1
+    report = {"rounds": count, "fetch": {}}
+    for prefetch in args.prefetch:
+        fetcher = blocks.BlockFetcher(acl, blocks.BlockCache(count), prefetch)
+        _, report["fetch"][prefetch] = bench.rate(count, _read, fetcher,
+                                                  first, last)
+        fetcher.close()
+    fetcher = blocks.BlockFetcher(acl, fetcher.cache, max(args.prefetch))
+    _, report["memory_cache"] = bench.rate(count, _read, fetcher, first, last)
+    fetcher.close()
+
+    if args.cache_dir:
+        spill = tempfile.mkdtemp(dir=args.cache_dir)
+        try:
+            fetcher = blocks.BlockFetcher(acl, blocks.BlockCache(count, spill),
+                                          max(args.prefetch))
+            _read(fetcher, first, last)
+            fetcher.close()
+            # a fresh cache has nothing in memory but everything on disk
+            fetcher = blocks.BlockFetcher(acl, blocks.BlockCache(count, spill),
+                                          max(args.prefetch))
+            _, report["disk_cache"] = bench.rate(count, _read, fetcher,
+                                                 first, last)
+            if fetcher.cache.misses:
+                sys.exit("{} blocks missing from the disk cache".format(
+                    fetcher.cache.misses))
+            fetcher.close()
+        finally:
+            shutil.rmtree(spill)
+    bench.emit(report, args.report)
+
+
+if __name__ == "__main__":
+    main()
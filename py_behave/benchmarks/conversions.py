@@ -0,0 +1,94 @@
+"""Batch mnemonic and address conversion benchmark.
+
+    python -m benchmarks.conversions [--count 100000] [--processes 4]
+        [--report FILE]
+
+Converts --count generated master derivation keys to mnemonics and back
+and public keys to addresses and back, one algosdk call per value, with
+the batch functions of harness.convert and, with --processes, with the
+batch functions spread over that many worker processes. The batch
+functions are first checked against the offline.feature golden mnemonics
+and against the SDK on the generated inputs. Rates are conversions per
+second.
+"""
+import argparse
+import base64
+import random
+import sys
+
+from algosdk import encoding
+from algosdk import mnemonic
+
+from harness import bench
+from harness import convert
+from harness import vectors
+
+# (name, SDK function converting one value, batch function)
+CONVERSIONS = [
+    ("mdk_to_mnemonic", mnemonic.from_master_derivation_key,
+     convert.mnemonics_from_master_derivation_keys),
+    ("mnemonic_to_mdk", mnemonic.to_master_derivation_key,
+     convert.master_derivation_keys_from_mnemonics),
+    ("encode_address", encoding.encode_address, convert.encode_addresses),
+    ("decode_address", encoding.decode_address, convert.decode_addresses),
+]
+
+
+def check_goldens():
+    for scenario, sdk, to_key, from_key in [
+            ("Mnemonic to and from private key", mnemonic.to_private_key,
+             convert.private_keys_from_mnemonics,
+             convert.mnemonics_from_private_keys),
+            ("Mnemonic to and from master derivation key",
+             mnemonic.to_master_derivation_key,
+             convert.master_derivation_keys_from_mnemonics,
+             convert.mnemonics_from_master_derivation_keys)]:
+        mns = [row["mn"] for row in vectors.examples(scenario)]
+        keys = to_key(mns)
+        if keys != [sdk(mn) for mn in mns]:
+            sys.exit("{}: keys differ from the SDK's".format(scenario))
+        if from_key(keys) != mns:
+            sys.exit("{}: mnemonics do not round-trip".format(scenario))
+
+
+def inputs(count):
+    rng = random.Random(0)
+    keys = [rng.getrandbits(256).to_bytes(32, "little") for _ in range(count)]
+    mdks = [base64.b64encode(k).decode() for k in keys]
+    return {
+        "mdk_to_mnemonic": mdks,
+        "mnemonic_to_mdk": convert.mnemonics_from_master_derivation_keys(mdks),
+        "encode_address": keys,
+        "decode_address": convert.encode_addresses(keys),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--processes", type=int)
+    parser.add_argument("--report", help="write the report as JSON here")
+    args = parser.parse_args(argv)
+
+    check_goldens()
+    data = inputs(args.count)
+    report = {"count": args.count}
+    for name, sdk, batch in CONVERSIONS:
+        values = data[name]
+        expected, sdk_rate = bench.rate(args.count,
+                                        lambda: [sdk(v) for v in values])
+        result, batch_rate = bench.rate(args.count, batch, values)
+        if result != expected:
+            sys.exit("{}: batch result differs from the SDK's".format(name))
+        report[name] = {"sdk": sdk_rate, "batch": batch_rate}
+        if args.processes:
+            result, report[name]["pool"] = bench.rate(
+                args.count, convert.in_pool, batch, values, args.processes)
+            if result != expected:
+                sys.exit("{}: pool result differs from the SDK's".format(
+                    name))
+    bench.emit(report, args.report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""kmd key provisioning benchmark.
+
+    python -m benchmarks.kmd_keys [--keys 500] [--workers 8] [--report FILE]
+
+Generates, exports, deletes and imports --keys keys in the default wallet
+of the node in NODE_DIR, first one wallet.Wallet call at a time with a
+list_keys membership check after each, the way the kmd steps used to, then
+with the batch methods of harness.keyring.KeyRing. Keys generated here are
+deleted again afterwards; imported keys are checked to export to the same
+private keys. Rates are keys per second.
+"""
+import argparse
+import sys
+
+from algosdk import account
+from algosdk import wallet
+
+from harness import bench
+from harness import clients
+from harness import DEFAULT_WALLET
+from harness.keyring import KeyRing
+
+
+def per_call(w, sks):
+    for sk in sks:
+        address = w.import_key(sk)
+        assert address in w.list_keys()
+    for sk in sks:
+        w.delete_key(account.address_from_private_key(sk))
+
+
+def batched(ring, sks):
+    addresses = ring.import_keys(sks)
+    assert all(ring.has_key(a) for a in addresses)
+    if ring.export_keys(addresses) != list(sks):
+        sys.exit("exported keys differ from the imported ones")
+    ring.delete_keys(addresses)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--keys", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--report", help="write the report as JSON here")
+    args = parser.parse_args(argv)
+
+    w = wallet.Wallet(DEFAULT_WALLET, "", clients.kmd_client())
+    sks = [account.generate_account()[0] for _ in range(args.keys)]
+    report = {"keys": args.keys, "workers": args.workers}
+    _, report["per_call_import"] = bench.rate(args.keys, per_call, w, sks)
+    ring = KeyRing(w, workers=args.workers)
+    _, report["batched_import_export"] = bench.rate(args.keys, batched,
+                                                    ring, sks)
+    addresses, report["batched_generate"] = bench.rate(
+        args.keys, ring.generate_keys, args.keys)
+    ring.delete_keys(addresses)
+    bench.emit(report, args.report)
+
+
+if __name__ == "__main__":
+    main()
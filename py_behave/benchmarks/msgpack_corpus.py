@@ -0,0 +1,156 @@
+"""Msgpack encode/decode corpus runner.
+
+    python -m benchmarks.msgpack_corpus [--copies 2000] [--corpus FILE]
+
+Round-trips a corpus of encoded objects through encoding.msgpack_decode and
+encoding.msgpack_encode in bulk, the way equal_golden, dec_mtx, mtxs and
+enc_dec_bid do for one blob at a time. The built-in corpus holds every
+encoded transaction in offline.feature and crosstest.feature (payments,
+keyreg, multisig, partial multisigs) plus generated asset config, transfer
+and freeze transactions, bids and signed bids; --corpus replaces it with a
+file of "kind<TAB>base64" lines (the kind is optional), which
+--write-corpus produces. The corpus is repeated --copies times.
+
+Reports decode, encode and round-trip bytes/sec per kind, the memory
+blocks and bytes each decoded object keeps alive (as seen by
+tracemalloc), and the first blob that does not survive the round trip.
+"""
+import argparse
+import base64
+import time
+import tracemalloc
+from collections import defaultdict
+
+from algosdk import account
+from algosdk import auction
+from algosdk import encoding
+from algosdk import transaction
+
+from harness import bench
+from harness import vectors
+
+
+def _feature_blobs():
+    for scenario, column, kind in (
+            ("Sign transaction", "golden", "payment"),
+            ("Sign transaction with flat fee", "golden", "payment"),
+            ("Create key registration transaction", "golden", "keyreg"),
+            ("Sign multisig", "golden", "multisig"),
+            ("Append multisig", "mtx", "multisig"),
+            ("Append multisig", "golden", "multisig"),
+            ("Merge multisig", "golden", "multisig")):
+        for row in vectors.examples(scenario):
+            yield kind, row[column]
+    for row in vectors.examples("Merge multisig"):
+        for blob in row["msigtxns"].split(" "):
+            yield "multisig", blob
+    for row in vectors.examples("Encoding", "crosstest.feature"):
+        yield "crosstest", row["txn"]
+
+
+def _generated_blobs():
+    row = vectors.examples("Sign transaction")[0]
+    sk = vectors.private_key(row)
+    pk = account.address_from_private_key(sk)
+    fv, lv, gh = int(row["fv"]), int(row["lv"]), row["gh"]
+    txns = {
+        "asset_config": transaction.AssetConfigTxn(
+            pk, 10, fv, lv, gh, total=100, default_frozen=False,
+            unit_name="unit", asset_name="asset", manager=pk, reserve=pk,
+            freeze=pk, clawback=pk),
+        "asset_transfer": transaction.AssetTransferTxn(
+            pk, 10, fv, lv, gh, row["to"], 50, 1),
+        "asset_freeze": transaction.AssetFreezeTxn(
+            pk, 10, fv, lv, gh, 1, row["to"], True),
+    }
+    for kind, txn in txns.items():
+        yield kind, encoding.msgpack_encode(txn.sign(sk))
+    bid = auction.Bid(pk, 1, 2, 3, pk, 4)
+    yield "bid", encoding.msgpack_encode(bid)
+    yield "signed_bid", encoding.msgpack_encode(bid.sign(sk))
+
+
+def builtin_corpus():
+    return list(_feature_blobs()) + list(_generated_blobs())
+
+
+def read_corpus(path):
+    corpus = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                kind, _, blob = line.rpartition("\t")
+                corpus.append((kind or "file", blob))
+    return corpus
+
+
+def first_mismatch(corpus):
+    for i, (kind, blob) in enumerate(corpus):
+        again = encoding.msgpack_encode(encoding.msgpack_decode(blob))
+        if again != blob:
+            return {"index": i, "kind": kind, "expected": blob,
+                    "got": again}
+    return None
+
+
+def retained(blobs):
+    """Memory blocks and bytes kept alive per decoded object."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [encoding.msgpack_decode(b) for b in blobs]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+    n = len(objects)
+    return {"blocks": sum(s.count_diff for s in diff) / n,
+            "bytes": sum(s.size_diff for s in diff) / n}
+
+
+def throughput(blobs):
+    size = sum(len(base64.b64decode(b)) for b in blobs)
+    start = time.perf_counter()
+    objects = [encoding.msgpack_decode(b) for b in blobs]
+    decoded = time.perf_counter()
+    for obj in objects:
+        encoding.msgpack_encode(obj)
+    encoded = time.perf_counter()
+    return {"objects": len(blobs),
+            "decode_bytes_per_second": size / (decoded - start),
+            "encode_bytes_per_second": size / (encoded - decoded),
+            "round_trip_bytes_per_second": size / (encoded - start)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--copies", type=int, default=2000)
+    parser.add_argument("--corpus", help="read the corpus from this file")
+    parser.add_argument("--write-corpus",
+                        help="write the corpus to this file and exit")
+    parser.add_argument("--report", help="write the report as JSON here")
+    args = parser.parse_args(argv)
+
+    corpus = read_corpus(args.corpus) if args.corpus else builtin_corpus()
+    if args.write_corpus:
+        with open(args.write_corpus, "w") as f:
+            f.writelines("{}\t{}\n".format(k, b) for k, b in corpus)
+        return
+    report = {"mismatch": first_mismatch(corpus), "kinds": {}}
+    by_kind = defaultdict(list)
+    for kind, blob in corpus:
+        by_kind[kind].append(blob)
+    for kind, blobs in sorted(by_kind.items()):
+        blobs = blobs * args.copies
+        stats = throughput(blobs)
+        stats["retained_per_object"] = retained(blobs[:10000])
+        report["kinds"][kind] = stats
+    everything = [b for _, b in corpus] * args.copies
+    report["total"] = throughput(everything)
+    bench.emit(report, args.report)
+    if report["mismatch"]:
+        raise SystemExit("round trip mismatch at corpus entry {}".format(
+            report["mismatch"]["index"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Multisig aggregation benchmark.
+
+    python -m benchmarks.multisig_merge [--txns 2000] [--signers 11]
+        [--threshold 6] [--report FILE]
+
+Has every one of --signers keys sign its own partial of each of --txns
+payments from a --threshold-of---signers multisig, shuffles the encoded
+partials into one arrival order, and times collecting them into fully
+signed transactions: first the way the merge step does it, decoding every
+partial and merging each transaction's partials with
+MultisigTransaction.merge, then with harness.msig.MultisigAggregator, from
+decoded partials (add) and from the encodings (add_encoded). The
+aggregator is checked against the Merge multisig golden in offline.feature
+and against MultisigTransaction.merge on the whole batch. Rates are
+partials per second.
+"""
+import argparse
+import random
+import sys
+from collections import defaultdict
+
+from algosdk import account
+from algosdk import encoding
+from algosdk import transaction
+
+from harness import bench
+from harness import vectors
+from harness.msig import MultisigAggregator
+
+
+def check_golden():
+    row = vectors.examples("Merge multisig")[0]
+    aggregator = MultisigAggregator()
+    done = [aggregator.add_encoded(m) for m in row["msigtxns"].split(" ")]
+    if encoding.msgpack_encode(done[-1]) != row["golden"]:
+        sys.exit("aggregated multisig does not match the Merge multisig "
+                 "golden")
+
+
+def partials(txns, signers, threshold):
+    keys = [account.generate_account() for _ in range(signers)]
+    msig = transaction.Multisig(1, threshold, [pk for _, pk in keys])
+    row = vectors.examples("Sign transaction")[0]
+    encoded = []
+    for i in range(txns):
+        txn = vectors.payment(row, i, sender=msig.address())
+        for sk, _ in keys:
+            mtx = transaction.MultisigTransaction(
+                txn, msig.get_multisig_account())
+            mtx.sign(sk)
+            encoded.append(encoding.msgpack_encode(mtx))
+    random.Random(0).shuffle(encoded)
+    return encoded
+
+
+def sdk_merge(encoded):
+    groups = defaultdict(list)
+    for blob in encoded:
+        mtx = encoding.msgpack_decode(blob)
+        groups[mtx.transaction.get_txid()].append(mtx)
+    return {txid: transaction.MultisigTransaction.merge(group)
+            for txid, group in groups.items()}
+
+
+def aggregate(partials, add):
+    aggregator = MultisigAggregator()
+    done = {}
+    for partial in partials:
+        mtx = getattr(aggregator, add)(partial)
+        if mtx is not None:
+            done[mtx.transaction.get_txid()] = mtx
+    return done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--txns", type=int, default=2000)
+    parser.add_argument("--signers", type=int, default=11)
+    parser.add_argument("--threshold", type=int)
+    parser.add_argument("--report", help="write the report as JSON here")
+    args = parser.parse_args(argv)
+    threshold = args.threshold or args.signers // 2 + 1
+
+    check_golden()
+    encoded = partials(args.txns, args.signers, threshold)
+    count = len(encoded)
+    merged, sdk_rate = bench.rate(count, sdk_merge, encoded)
+    decoded = [encoding.msgpack_decode(blob) for blob in encoded]
+    by_object, add_rate = bench.rate(count, aggregate, decoded, "add")
+    by_encoding, encoded_rate = bench.rate(count, aggregate, encoded,
+                                           "add_encoded")
+    for done in (by_object, by_encoding):
+        if len(done) != args.txns:
+            sys.exit("{} of {} transactions reached the threshold".format(
+                len(done), args.txns))
+        for txid, mtx in done.items():
+            # merge keeps every signature, the aggregator only the first
+            # `threshold`, so compare which of them the aggregator kept
+            full = merged[txid].multisig.subsigs
+            for got, want in zip(mtx.multisig.subsigs, full):
+                if got.signature and got.signature != want.signature:
+                    sys.exit("signatures of {} differ from merge".format(
+                        txid))
+            if mtx.multisig.address() != mtx.transaction.sender:
+                sys.exit("multisig of {} does not match its sender".format(
+                    txid))
+    bench.emit({"txns": args.txns, "signers": args.signers,
+                "threshold": threshold, "partials": count,
+                "sdk_merge": sdk_rate, "aggregator_add": add_rate,
+                "aggregator_add_encoded": encoded_rate}, args.report)
+
+
+if __name__ == "__main__":
+    main()
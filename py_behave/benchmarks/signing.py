@@ -0,0 +1,171 @@
+"""Batch offline signing benchmark.
+
+    python -m benchmarks.signing [--count 20000] [--kmd 200] [--report FILE]
+
+Signs generated batches derived from the offline.feature golden vectors:
+single-sig payments (sign_with_sk), multisig payments (sign_msig),
+appending a signature to a partially signed multisig (append_mtx) and
+merging partial multisigs (merge_mtxs). Each kind is first checked against
+its golden, then timed in this process and in process pools of 1, 2, 4, ...
+workers up to the number of cores. With --kmd, that many transactions are
+also signed through kmd (sign_kmd, sign_msig_kmd) with the default wallet of
+the node in NODE_DIR, checked against local signatures of the same key.
+Rates are operations per second and include building each transaction,
+except that merges are timed over partials decoded beforehand (the pool
+rates still include that decoding).
+"""
+import argparse
+import copy
+import functools
+
+from algosdk import encoding
+from algosdk import transaction
+from algosdk import wallet
+
+from harness import bench
+from harness import clients
+from harness import DEFAULT_WALLET
+from harness import vectors
+
+_rows = {}
+
+
+def _row(scenario):
+    if scenario not in _rows:
+        _rows[scenario] = vectors.examples(scenario)[0]
+    return _rows[scenario]
+
+
+def single(start, count):
+    row = _row("Sign transaction")
+    sk = vectors.private_key(row)
+    return [vectors.payment(row, i).sign(sk)
+            for i in range(start, start + count)]
+
+
+def multisig(start, count):
+    row = _row("Sign multisig")
+    sk = vectors.private_key(row)
+    sender = vectors.multisig(row).address()
+    signed = []
+    for i in range(start, start + count):
+        mtx = transaction.MultisigTransaction(
+            vectors.payment(row, i, sender=sender), vectors.multisig(row))
+        mtx.sign(sk)
+        signed.append(mtx)
+    return signed
+
+
+def append(start, count):
+    row = _row("Append multisig")
+    sk = vectors.private_key(row)
+    base = encoding.msgpack_decode(row["mtx"])
+    signed = []
+    for i in range(start, start + count):
+        txn = copy.copy(base.transaction)
+        txn.first_valid_round += i
+        txn.last_valid_round += i
+        mtx = transaction.MultisigTransaction(txn,
+                                              copy.deepcopy(base.multisig))
+        mtx.sign(sk)
+        signed.append(mtx)
+    return signed
+
+
+def merge_inputs(start, count):
+    """Freshly decoded partials for each of `count` merges; merging fills
+    the signatures into the first partial, so a list can't be merged
+    twice."""
+    blobs = _row("Merge multisig")["msigtxns"].split(" ")
+    return [[encoding.msgpack_decode(m) for m in blobs]
+            for _ in range(count)]
+
+
+def merge(inputs):
+    return [transaction.MultisigTransaction.merge(partials)
+            for partials in inputs]
+
+
+KINDS = {"single": single, "multisig": multisig, "append": append,
+         "merge": merge}
+# kinds whose inputs are built before the timed call
+SETUP = {"merge": merge_inputs}
+GOLDENS = {"single": "Sign transaction", "multisig": "Sign multisig",
+           "append": "Append multisig", "merge": "Merge multisig"}
+
+
+def _args(kind, start, count):
+    if kind in SETUP:
+        return (SETUP[kind](start, count),)
+    return (start, count)
+
+
+def _signed(kind, start, count):
+    # only the count crosses the process boundary, not the signatures
+    return len(KINDS[kind](*_args(kind, start, count)))
+
+
+def check_goldens():
+    for kind, fn in KINDS.items():
+        got = encoding.msgpack_encode(fn(*_args(kind, 0, 1))[0])
+        if got != _row(GOLDENS[kind])["golden"]:
+            raise SystemExit("{} signing does not match the golden of {!r}"
+                             .format(kind, GOLDENS[kind]))
+
+
+def kmd_rates(count):
+    kcl = clients.kmd_client()
+    w = wallet.Wallet(DEFAULT_WALLET, "", kcl)
+    accounts = w.list_keys()
+    sk = w.export_key(accounts[0])
+    row = _row("Sign transaction")
+    txns = [vectors.payment(row, i, sender=accounts[0])
+            for i in range(count)]
+    if encoding.msgpack_encode(w.sign_transaction(txns[0])) != \
+            encoding.msgpack_encode(txns[0].sign(sk)):
+        raise SystemExit("kmd signature differs from the local one")
+    _, single_rate = bench.rate(
+        count, lambda: [w.sign_transaction(t) for t in txns])
+
+    sender = transaction.Multisig(1, 1, accounts).address()
+    mtxs = [transaction.MultisigTransaction(
+        vectors.payment(row, i, sender=sender),
+        transaction.Multisig(1, 1, accounts)) for i in range(count)]
+    local = copy.deepcopy(mtxs[0])
+    local.sign(sk)
+    kmd_signed = w.sign_multisig_transaction(accounts[0],
+                                             copy.deepcopy(mtxs[0]))
+    if encoding.msgpack_encode(kmd_signed) != encoding.msgpack_encode(local):
+        raise SystemExit("kmd multisig signature differs from the local one")
+    _, msig_rate = bench.rate(
+        count,
+        lambda: [w.sign_multisig_transaction(accounts[0], m) for m in mtxs])
+    return {"single": single_rate, "multisig": msig_rate}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--processes", type=int,
+                        help="largest process pool to try (default: cores)")
+    parser.add_argument("--kmd", type=int, default=0,
+                        help="also sign this many transactions with kmd")
+    parser.add_argument("--report", help="write the report as JSON here")
+    args = parser.parse_args(argv)
+
+    check_goldens()
+    report = {}
+    for kind, fn in KINDS.items():
+        _, per_second = bench.rate(args.count, fn, *_args(kind, 0, args.count))
+        report[kind] = {
+            "in_process": per_second,
+            "pool": bench.scaling(functools.partial(_signed, kind),
+                                  args.count, args.processes),
+        }
+    if args.kmd:
+        report["kmd"] = kmd_rates(args.kmd)
+    bench.emit(report, args.report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Runner start-up benchmark.
+
+    python -m benchmarks.startup [--feature offline.feature]
+        [--name "Encode and decode addresses"] [--repeat 5] [--top 15]
+        [--report FILE]
+
+Runs behave on the scenarios of --feature named --name, --repeat times
+each with and without FAST_START, and reports the median time from
+starting the process to the first step (written by the before_step hook
+to FIRST_STEP_FILE) and to the end of the run. Every run must pass. It
+then loads the environment hooks and step definitions under
+`python -X importtime` in both modes and lists the --top top-level
+packages by the time spent importing their modules.
+"""
+import argparse
+import collections
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from harness import bench
+
+PY_BEHAVE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FEATURES_DIR = os.path.join(os.path.dirname(PY_BEHAVE), "features")
+MODES = {"default": "", "fast_start": "1"}
+
+
+def _env(fast_start, first_step_file=None):
+    env = dict(os.environ, FAST_START=fast_start)
+    env.pop("FIRST_STEP_FILE", None)
+    if first_step_file:
+        env["FIRST_STEP_FILE"] = first_step_file
+    return env
+
+
+def _run(workdir, feature, name, fast_start):
+    stamp = os.path.join(workdir, "first-step")
+    if os.path.exists(stamp):
+        os.remove(stamp)
+    env = _env(fast_start, stamp)
+    start = time.time()
+    proc = subprocess.run([sys.executable, "-m", "behave", "-n", name,
+                           "-f", "progress", feature], cwd=workdir, env=env,
+                          stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    end = time.time()
+    if proc.returncode:
+        sys.exit(proc.stdout.decode(errors="replace"))
+    if not os.path.exists(stamp):
+        sys.exit("no step of {!r} matched --name {!r}".format(feature, name))
+    with open(stamp) as f:
+        first = float(f.read())
+    return first - start, end - start
+
+
+def _imports(fast_start, top):
+    """Import time of the hooks and steps, loaded the way behave loads
+    them, in ms per top-level package."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         "import environment\n"
+         "from behave.runner_util import load_step_modules\n"
+         "load_step_modules(['steps'])"],
+        cwd=PY_BEHAVE, env=_env(fast_start), stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE)
+    if proc.returncode:
+        sys.exit(proc.stderr.decode(errors="replace"))
+    packages = collections.Counter()
+    for line in proc.stderr.decode().splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, _, name = line[len("import time:"):].split("|")
+        if own.strip().isdigit():
+            packages[name.strip().split(".")[0]] += int(own) / 1000
+    return {"total_ms": sum(packages.values()),
+            "packages_ms": dict(packages.most_common(top))}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--feature", default="offline.feature")
+    parser.add_argument("--name", default="Encode and decode addresses",
+                        help="behave --name of the scenarios to run")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--report", help="write the report as JSON here")
+    args = parser.parse_args(argv)
+
+    # a directory laid out like the one test.sh prepares, with only the
+    # feature being timed in it
+    workdir = tempfile.mkdtemp()
+    try:
+        for name in ("environment.py", "harness", "steps"):
+            os.symlink(os.path.join(PY_BEHAVE, name),
+                       os.path.join(workdir, name))
+        shutil.copy(os.path.join(FEATURES_DIR, args.feature), workdir)
+        report = {"feature": args.feature, "name": args.name, "runs": {}}
+        for mode, fast_start in MODES.items():
+            times = [_run(workdir, args.feature, args.name, fast_start)
+                     for _ in range(args.repeat)]
+            report["runs"][mode] = {
+                "first_step_s": statistics.median(t[0] for t in times),
+                "total_s": statistics.median(t[1] for t in times),
+            }
+    finally:
+        shutil.rmtree(workdir)
+    report["imports"] = {mode: _imports(fast_start, args.top)
+                         for mode, fast_start in MODES.items()}
+    bench.emit(report, args.report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Transaction batch memory benchmark.
+
+    python -m benchmarks.txn_memory [--txns 20000] [--accounts 16]
+        [--report FILE]
+
+Builds --txns payments the way "default transaction with parameters"
+builds them and --txns asset transfers the way the asset transfer steps
+do, between --accounts generated accounts. It then signs them, once as
+SDK objects (PaymentTxn, AssetTransferTxn, SignedTransaction) and once
+in a harness.txnbatch.TxnBatch. It reports the memory each kind keeps
+per transaction, measured with tracemalloc, before and after signing.
+Every signed transaction materialized from the batch must encode the
+same as its SDK counterpart, and the rate of materializing them is
+reported too. TxnBatch is first checked against the "Sign transaction"
+goldens.
+"""
+import argparse
+import base64
+import sys
+import tracemalloc
+
+from algosdk import account
+from algosdk import encoding
+from algosdk import transaction
+
+from harness import bench
+from harness import vectors
+from harness.txnbatch import TxnBatch
+
+ASSET = 1
+
+
+def _check_golden():
+    for scenario, flat_fee in (("Sign transaction", False),
+                               ("Sign transaction with flat fee", True)):
+        row = vectors.examples(scenario)[0]
+        sk = vectors.private_key(row)
+        batch = TxnBatch()
+        batch.add_payment(account.address_from_private_key(sk),
+                          int(row["fee"]), int(row["fv"]), int(row["lv"]),
+                          row["gh"], row["to"], int(row["amt"]), row["close"],
+                          base64.b64decode(row["note"]), row["gen"],
+                          flat_fee=flat_fee)
+        batch.sign_all(sk)
+        if encoding.msgpack_encode(batch[0]) != row["golden"]:
+            sys.exit("TxnBatch does not match the {!r} golden".format(
+                scenario))
+
+
+def _args(kind, i, accounts, row):
+    sender = accounts[i % len(accounts)][1]
+    receiver = accounts[(i + 1) % len(accounts)][1]
+    first = int(row["fv"]) + i
+    if kind == "pay":
+        return (sender, int(row["fee"]), first, first + 1000, row["gh"],
+                receiver, 1000 + i), {"note": str(i).encode(),
+                                      "gen": row["gen"]}
+    return (sender, 10, first, first + 1000, row["gh"], receiver, i,
+            ASSET), {}
+
+
+def _traced(fn):
+    """fn's result and the bytes still allocated for it."""
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    return result, tracemalloc.get_traced_memory()[0] - before
+
+
+def _sdk(kind, count, accounts, row):
+    cls = transaction.PaymentTxn if kind == "pay" else \
+        transaction.AssetTransferTxn
+    txns = []
+    for i in range(count):
+        args, kwargs = _args(kind, i, accounts, row)
+        txns.append(cls(*args, **kwargs))
+    return txns
+
+
+def _sign(txns, accounts):
+    keys = {address: sk for sk, address in accounts}
+    return [txn.sign(keys[txn.sender]) for txn in txns]
+
+
+def _batch(kind, count, accounts, row):
+    add = TxnBatch.add_payment if kind == "pay" else TxnBatch.add_transfer
+    batch = TxnBatch()
+    for i in range(count):
+        args, kwargs = _args(kind, i, accounts, row)
+        add(batch, *args, **kwargs)
+    return batch
+
+
+def _materialize(batch):
+    return [batch.encode(i) for i in range(len(batch))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--txns", type=int, default=20000)
+    parser.add_argument("--accounts", type=int, default=16)
+    parser.add_argument("--report", help="write the report as JSON here")
+    args = parser.parse_args(argv)
+
+    _check_golden()
+    row = vectors.examples("Sign transaction")[0]
+    accounts = [account.generate_account() for _ in range(args.accounts)]
+    report = {"txns": args.txns}
+    for kind in ("pay", "axfer"):
+        tracemalloc.start()
+        txns, unsigned = _traced(lambda: _sdk(kind, args.txns, accounts,
+                                              row))
+        signed, sigs = _traced(lambda: _sign(txns, accounts))
+        total = unsigned + sigs
+        batch, batch_unsigned = _traced(lambda: _batch(kind, args.txns,
+                                                       accounts, row))
+        before = tracemalloc.get_traced_memory()[0]
+        for sk, _ in accounts:
+            batch.sign_all(sk)
+        batch_signed = batch_unsigned + \
+            tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+
+        encoded, rate = bench.rate(len(batch), _materialize, batch)
+        for i, stx in enumerate(signed):
+            if base64.b64decode(encoding.msgpack_encode(stx)) != encoded[i]:
+                sys.exit("{} {} differs from the SDK object".format(kind, i))
+        report[kind] = {
+            "sdk_bytes_per_txn": {"unsigned": unsigned / args.txns,
+                                  "signed": total / args.txns},
+            "batch_bytes_per_txn": {"unsigned": batch_unsigned / args.txns,
+                                    "signed": batch_signed / args.txns},
+            "signed_ratio": total / batch_signed,
+            "materialized_per_second": rate,
+        }
+    bench.emit(report, args.report)
+
+
+if __name__ == "__main__":
+    main()
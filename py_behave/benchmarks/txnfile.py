@@ -0,0 +1,108 @@
+"""Streaming transaction file benchmark and cross-check.
+
+    python -m benchmarks.txnfile [--mb 300] [--path FILE] [--compare]
+    python -m benchmarks.txnfile --check FILE_A FILE_B
+
+Writes a file of about --mb megabytes of signed payments with the
+streaming writer, reads it back lazily, and reports write and read MB/s and
+peak Python memory for each. The payments cycle through --pool transactions
+signed before timing starts, so the write rate is the writer's, not the
+signer's. Each step runs twice: once timed, and once under tracemalloc for
+its peak memory, since tracing slows it down several times. With --compare
+it also reads the file with transaction.retrieve_from_file for reference,
+which holds the whole file in memory. --check compares two transaction
+files, for example one written by another SDK, transaction by transaction
+without loading either, and exits non-zero at the first difference.
+"""
+import argparse
+import itertools
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from algosdk import transaction
+
+from harness import bench
+from harness import txnfile
+from harness import vectors
+
+
+def _measure(fn):
+    """fn()'s result, its seconds untraced and its peak traced memory."""
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--mb", type=float, default=300)
+    parser.add_argument("--pool", type=int, default=1000,
+                        help="distinct signed payments to cycle through")
+    parser.add_argument("--path", help="file to write (default: a temp file,"
+                                       " removed afterwards)")
+    parser.add_argument("--compare", action="store_true",
+                        help="also time transaction.retrieve_from_file")
+    parser.add_argument("--check", nargs=2, metavar="FILE")
+    parser.add_argument("--report", help="write the report as JSON here")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        index = txnfile.first_difference(*args.check)
+        if index is not None:
+            sys.exit("files differ at transaction {}".format(index))
+        sys.stdout.write("files match\n")
+        return
+
+    path = args.path
+    if not path:
+        fd, path = tempfile.mkstemp(suffix=".tx")
+        os.close(fd)
+    try:
+        row = vectors.examples("Sign transaction")[0]
+        sk = vectors.private_key(row)
+        signed = [vectors.payment(row, i).sign(sk) for i in range(args.pool)]
+
+        def write():
+            with txnfile.TxnFileWriter(path) as w:
+                for stx in itertools.cycle(signed):
+                    if w.size >= args.mb * 1e6:
+                        return w.count
+                    w.write(stx)
+        count, write_time, write_peak = _measure(write)
+        mb = os.path.getsize(path) / 1e6
+
+        def read():
+            return sum(1 for _ in txnfile.iter_file(path))
+        read_count, read_time, read_peak = _measure(read)
+        if read_count != count:
+            sys.exit("wrote {} transactions but read back {}".format(
+                count, read_count))
+        report = {
+            "transactions": count,
+            "mb": mb,
+            "write": {"mb_per_second": mb / write_time,
+                      "peak_bytes": write_peak},
+            "stream_read": {"mb_per_second": mb / read_time,
+                            "peak_bytes": read_peak},
+        }
+        if args.compare:
+            _, list_time, list_peak = _measure(
+                lambda: len(transaction.retrieve_from_file(path)))
+            report["retrieve_from_file"] = {"mb_per_second": mb / list_time,
+                                            "peak_bytes": list_peak}
+        bench.emit(report, args.report)
+    finally:
+        if not args.path:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
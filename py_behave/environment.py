@@ -0,0 +1,132 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+from harness import DEFAULT_WALLET
+from harness import faststart
+from harness import pool
+from harness.blocks import BlockCache
+from harness.memprofile import MemoryProfiler
+from harness.params import ParamsCache
+from harness.steptimes import StepTimes
+from harness.waiter import ConfirmationWaiter
+
+calls = faststart.module("harness.calls")
+fakenode = faststart.module("harness.fakenode")
+parallel = faststart.module("harness.parallel")
+
+
+def _key(scenario):
+    return "{} {}".format(scenario.location, scenario.name)
+
+
+def before_all(context):
+    if os.environ.get("FAKE_NODE"):
+        # point the client steps at an in-process node instead of NODE_DIR
+        context.fake_node = fakenode.FakeNode().start()
+        context.fake_node_dir = tempfile.TemporaryDirectory()
+        context.fake_node.write_data_dir(context.fake_node_dir.name)
+        os.environ["NODE_DIR"] = context.fake_node_dir.name
+        os.environ["KMD_DIR"] = fakenode.KMD_DIR
+    context.pool = None
+    size = int(os.environ.get("HTTP_POOL_SIZE", 8))
+    if size:
+        context.pool = pool.install(size)
+    context.waiter = ConfirmationWaiter.from_env()
+    context.params_cache = ParamsCache.from_env()
+    context.waiter.listeners.append(context.params_cache.observe_round)
+    context.latency_report = {}
+    context.block_cache = BlockCache.from_env()
+    context.step_times = StepTimes()
+    context.memory = MemoryProfiler.from_env()
+    context.calls = None
+    if os.environ.get("CLIENT_CALL_REPORT"):
+        context.calls = calls.CallRecorder()
+    context.worker_wallet = DEFAULT_WALLET
+    context.wallet_suffix = ""
+    worker = os.environ.get("BEHAVE_WORKER")
+    if worker is not None:
+        run_id = os.environ.get("BEHAVE_RUN_ID", "")
+        context.worker_wallet = parallel.provision(worker, context.waiter,
+                                                   run_id)
+        context.wallet_suffix = "-" + context.worker_wallet
+
+
+def before_feature(context, feature):
+    context.step_times.feature(feature)
+
+
+def before_scenario(context, scenario):
+    context.waiter.start_scenario()
+    context.step_times.scenario(scenario)
+    if context.calls:
+        context.calls.start_scenario(_key(scenario))
+    context.memory.start_scenario(_key(scenario), scenario.effective_tags)
+
+
+def before_step(context, step):
+    path = os.environ.pop("FIRST_STEP_FILE", None)
+    if path:
+        # read by benchmarks.startup
+        with open(path, "w") as f:
+            f.write(repr(time.time()))
+    context.memory.start_step()
+
+
+def after_step(context, step):
+    context.step_times.step(step)
+    context.memory.end_step(step.name)
+
+
+def after_scenario(context, scenario):
+    context.memory.end_scenario()
+    summary = context.waiter.summary()
+    if summary:
+        context.latency_report[_key(scenario)] = summary
+
+
+def after_all(context):
+    if hasattr(context, "fake_node"):
+        context.fake_node.stop()
+        context.fake_node_dir.cleanup()
+    if context.calls:
+        with open(os.environ["CLIENT_CALL_REPORT"], "w") as f:
+            json.dump(context.calls.report(), f, indent=2)
+    if os.environ.get("STEP_TIMINGS"):
+        context.step_times.write(os.environ["STEP_TIMINGS"])
+    if context.memory.report:
+        with open(os.environ["MEMORY_PROFILE"], "w") as f:
+            json.dump(context.memory.scenarios, f, indent=2)
+        sys.stdout.write("\nmemory peak (MB):\n")
+        for name, peak, limit in context.memory.summary():
+            sys.stdout.write("  {}: {:.1f}{}\n".format(
+                name, peak, "" if limit is None else
+                " (budget {:.1f})".format(limit)))
+    stats = context.params_cache.stats()
+    sys.stdout.write("suggested params cache: {} hits, {} misses\n".format(
+        stats["hits"], stats["misses"]))
+    stats = context.block_cache.stats()
+    if stats["hits"] or stats["misses"]:
+        sys.stdout.write("block cache: {} hits, {} from disk, {} misses\n"
+                         .format(stats["hits"], stats["disk_hits"],
+                                 stats["misses"]))
+    if context.pool:
+        stats = context.pool.stats()
+        sys.stdout.write("http pool: {} requests, {} connections opened, "
+                         "{} reused\n".format(stats["requests"],
+                                              stats["opened"],
+                                              stats["reused"]))
+        context.pool.close()
+    report = context.latency_report
+    if not report:
+        return
+    sys.stdout.write("\nconfirmation latency (s):\n")
+    for name, s in report.items():
+        sys.stdout.write("  {}: {} txns, mean {:.3f}, max {:.3f}\n".format(
+            name, s["confirmed"], s["mean"], s["max"]))
+    path = os.environ.get("TXN_LATENCY_REPORT")
+    if path:
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,4 @@
+"""Support code for the py_behave step definitions and environment hooks."""
+
+# the wallet `goal network create` puts the genesis accounts in
+DEFAULT_WALLET = "unencrypted-default-wallet"
@@ -0,0 +1,40 @@
+"""asyncio front end for the SDK's blocking algod and kmd clients.
+
+AsyncClient exposes every method of a wrapped client as a coroutine that
+runs the blocking call on a shared thread pool, so independent requests
+can be awaited together and cost roughly one round trip instead of the sum
+of all of them. The connections themselves come from the same keep-alive
+pool as the blocking clients (see harness.pool).
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+_executor = ThreadPoolExecutor(max_workers=8)
+
+
+class AsyncClient:
+    def __init__(self, client, executor=None):
+        self.client = client
+        self.executor = executor or _executor
+
+    def __getattr__(self, name):
+        method = getattr(self.client, name)
+
+        async def call(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.executor, functools.partial(method, *args, **kwargs))
+        return call
+
+
+def gather(*aws):
+    """Run the awaitables concurrently on a new event loop and return
+    their results in order."""
+    async def run():
+        return await asyncio.gather(*aws)
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(run())
+    finally:
+        loop.close()
@@ -0,0 +1,24 @@
+"""Ids of created assets, read from the asset creation's confirmation."""
+
+
+def _created(txn):
+    return (txn.get("txresults") or {}).get("createdasset")
+
+
+def created(acl, info):
+    """Id of the asset created by the confirmed AssetConfigTxn whose pending
+    info is `info`."""
+    index = _created(info)
+    if not index and info.get("round"):
+        # nodes that leave txresults out of the pending info still report
+        # it on the transaction in its block
+        block = acl.block_info(info["round"])
+        for txn in (block.get("txns") or {}).get("transactions") or []:
+            if txn.get("tx") == info.get("tx"):
+                index = _created(txn)
+                break
+    if not index:
+        raise ValueError(
+            "no created asset for transaction {} in its pending info or in "
+            "block {}".format(info.get("tx"), info.get("round")))
+    return index
@@ -0,0 +1,54 @@
+"""Timing and reporting helpers shared by the benchmarks."""
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+def rate(count, fn, *args):
+    """Call fn(*args) and return (result, items per second for `count`
+    items)."""
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    return result, count / elapsed if elapsed else float("inf")
+
+
+def pool_rate(fn, count, processes, chunk=None):
+    """Items per second of fn(start, n) over `count` items split into
+    chunks across `processes` worker processes, measured by wall clock.
+
+    fn must be a picklable top-level function and do its own setup, so
+    only chunk bounds cross the process boundary.
+    """
+    chunk = chunk or max(1, count // (processes * 4))
+    bounds = [(i, min(chunk, count - i)) for i in range(0, count, chunk)]
+    with ProcessPoolExecutor(processes) as pool:
+        # warm the workers up so process start-up is not timed
+        list(pool.map(fn, [0] * processes, [1] * processes))
+        start = time.perf_counter()
+        list(pool.map(fn, *zip(*bounds)))
+        elapsed = time.perf_counter() - start
+    return count / elapsed if elapsed else float("inf")
+
+
+def scaling(fn, count, max_processes=None):
+    """pool_rate for 1, 2, 4, ... processes up to the number of cores,
+    with each rate's efficiency relative to perfect linear scaling."""
+    max_processes = max_processes or os.cpu_count() or 1
+    procs, results = 1, {}
+    while procs <= max_processes:
+        results[procs] = pool_rate(fn, count, procs)
+        procs *= 2
+    base = results[1]
+    return {str(p): {"per_second": r, "efficiency": r / (base * p)}
+            for p, r in results.items()}
+
+
+def emit(report, path=None):
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    if path:
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,125 @@
+"""Per-endpoint instrumentation of the algod and kmd clients.
+
+CallRecorder.wrap replaces every public method of a client instance with a
+wrapper that records the call count, a latency histogram and request and
+response payload sizes under "<client>.<method>", as well as how many
+calls of each kind every scenario made. Only the outermost call is
+recorded, so a client method implemented on top of another one (or a
+wallet.Wallet method calling the kmd client) counts once.
+
+Payload sizes are the length of the msgpack encoding for SDK objects and
+of the JSON encoding for everything else, so they approximate what went
+over the wire rather than measure it.
+"""
+import base64
+import bisect
+import functools
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+
+from algosdk import encoding
+
+# upper bounds of the latency histogram buckets, in milliseconds
+BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+
+def _size(value):
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode())
+    if isinstance(value, (dict, list, tuple, int, float, bool)):
+        return len(json.dumps(value, default=str))
+    try:
+        return len(base64.b64decode(encoding.msgpack_encode(value)))
+    except Exception:
+        return 0
+
+
+class Endpoint:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    def record(self, ms, request, response, failed):
+        self.calls += 1
+        self.errors += failed
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.buckets[bisect.bisect_left(BUCKETS, ms)] += 1
+        self.request_bytes += request
+        self.response_bytes += response
+
+    def json(self):
+        labels = ["<={}ms".format(b) for b in BUCKETS] + \
+            [">{}ms".format(BUCKETS[-1])]
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "mean_ms": self.total_ms / self.calls,
+            "max_ms": self.max_ms,
+            "histogram": {l: n for l, n in zip(labels, self.buckets) if n},
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+        }
+
+
+class CallRecorder:
+    def __init__(self):
+        self.endpoints = defaultdict(Endpoint)
+        self.scenarios = {}
+        self.current = None
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def start_scenario(self, name):
+        self.current = self.scenarios[name] = Counter()
+
+    def wrap(self, client, name):
+        for attr in dir(client):
+            method = getattr(client, attr)
+            if not attr.startswith("_") and callable(method):
+                setattr(client, attr, self._wrapper(method,
+                                                    name + "." + attr))
+        return client
+
+    def _wrapper(self, method, endpoint):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if getattr(self.local, "active", False):
+                return method(*args, **kwargs)
+            self.local.active = True
+            start = time.perf_counter()
+            result, failed = None, True
+            try:
+                result = method(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                ms = (time.perf_counter() - start) * 1000
+                self.local.active = False
+                request = sum(_size(a) for a in args) + \
+                    sum(_size(v) for v in kwargs.values())
+                with self.lock:
+                    self.endpoints[endpoint].record(ms, request,
+                                                    _size(result), failed)
+                    if self.current is not None:
+                        self.current[endpoint] += 1
+        return wrapper
+
+    def report(self):
+        return {
+            "endpoints": {k: v.json()
+                          for k, v in sorted(self.endpoints.items())},
+            "scenarios": {k: dict(v) for k, v in self.scenarios.items()
+                          if v},
+        }
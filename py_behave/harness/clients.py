@@ -0,0 +1,31 @@
+"""Clients for the node described by the NODE_DIR and KMD_DIR variables.
+
+Pass a harness.calls.CallRecorder as `recorder` to instrument the client.
+"""
+import os
+
+from algosdk import algod
+from algosdk import kmd
+
+
+def _read(path):
+    with open(path, "r") as f:
+        return f.read().strip("\n")
+
+
+def kmd_client(recorder=None):
+    data_dir_path = os.environ["NODE_DIR"] + "/"
+    kmd_folder_name = os.environ["KMD_DIR"] + "/"
+    kmd_token = _read(data_dir_path + kmd_folder_name + "kmd.token")
+    kmd_address = "http://" + _read(data_dir_path + kmd_folder_name +
+                                    "kmd.net")
+    client = kmd.KMDClient(kmd_token, kmd_address)
+    return recorder.wrap(client, "kmd") if recorder else client
+
+
+def algod_client(recorder=None):
+    data_dir_path = os.environ["NODE_DIR"] + "/"
+    algod_token = _read(data_dir_path + "algod.token")
+    algod_address = "http://" + _read(data_dir_path + "algod.net")
+    client = algod.AlgodClient(algod_token, algod_address)
+    return recorder.wrap(client, "algod") if recorder else client
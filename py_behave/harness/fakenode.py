@@ -0,0 +1,767 @@
+"""In-process stand-in for algod and kmd.
+
+FakeNode serves the subset of the algod and kmd v1 REST APIs that the step
+definitions use, backed by an in-memory ledger. Every accepted
+transaction, or atomic transaction group, is committed in its own block
+immediately, and waiting for a block simply produces empty blocks, so
+rounds advance instantly.
+
+Run it standalone with
+
+    python -m harness.fakenode DATA_DIR
+
+which writes algod.net/algod.token and kmd-v0.5/kmd.net/kmd.token under
+DATA_DIR, so it can be used anywhere NODE_DIR/KMD_DIR are expected.
+"""
+import base64
+import copy
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import msgpack
+from nacl.exceptions import BadSignatureError
+from nacl.signing import SigningKey, VerifyKey
+
+from algosdk import constants
+from algosdk import encoding
+from algosdk import transaction
+
+from harness import DEFAULT_WALLET
+
+GENESIS_ID = "fakenet-v1"
+GENESIS_HASH = base64.b64encode(
+    hashlib.sha256(b"fakenet genesis").digest()).decode()
+PROTOCOL = "future"
+MIN_FEE = 1000
+MIN_BALANCE = 100000
+INITIAL_BALANCE = 10 ** 14
+DEFAULT_WALLET_KEYS = 2
+KMD_DIR = "kmd-v0.5"
+TOKEN = "a" * 64
+
+
+class NodeError(Exception):
+    """A request was rejected; `status` is the HTTP status to reply with."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _seed(*parts):
+    return hashlib.sha256(b"/".join(parts)).digest()
+
+
+def _private_key(seed):
+    """algosdk-style private key (base64 of seed + public key)."""
+    sk = SigningKey(seed)
+    return base64.b64encode(seed + bytes(sk.verify_key)).decode()
+
+
+def _address(private_key):
+    return encoding.encode_address(base64.b64decode(private_key)[32:])
+
+
+def _txn_bytes(txn):
+    return base64.b64decode(encoding.msgpack_encode(txn))
+
+
+def _verify(public_key, txn, signature):
+    if isinstance(signature, str):
+        signature = base64.b64decode(signature)
+    try:
+        VerifyKey(public_key).verify(constants.txid_prefix + _txn_bytes(txn),
+                                     signature)
+    except (BadSignatureError, ValueError, TypeError):
+        raise NodeError("invalid signature")
+
+
+def _signed_txns(body):
+    """The signed or multisig transactions sent back to back in body."""
+    unpacker = msgpack.Unpacker(raw=False)
+    unpacker.feed(body)
+    signed = []
+    for d in unpacker:
+        if not isinstance(d, dict) or "txn" not in d:
+            raise NodeError("not a signed transaction")
+        if "msig" in d:
+            signed.append(transaction.MultisigTransaction.undictify(d))
+        else:
+            signed.append(transaction.SignedTransaction.undictify(d))
+    if not signed:
+        raise NodeError("no transactions sent")
+    return signed
+
+
+class Ledger:
+    """Account, asset and block state. The genesis hash and the wallet keys
+    are the same in every run, so transactions built against the ledger
+    match across runs and SDKs. Block seeds are random, as a real node's
+    are, and each block hash chains the previous one with the block's seed,
+    so no two ledgers share a block."""
+
+    def __init__(self):
+        self.genesis_hash = GENESIS_HASH
+        self.round = 0
+        self.balances = {}
+        self.holdings = {}
+        self.assets = {}
+        self.next_asset = 1
+        self.blocks = {}
+        self.txns = {}
+        self.advance()
+
+    def _block(self, rnd, txns):
+        previous = self.blocks[rnd - 1]["hash"] if rnd > 1 \
+            else self.genesis_hash
+        seed = os.urandom(32)
+        return {
+            "round": rnd,
+            "hash": base64.b64encode(_seed(
+                b"block", base64.b64decode(previous), seed)).decode(),
+            "previousBlockHash": previous,
+            "seed": base64.b64encode(seed).decode(),
+            "proposer": "",
+            "period": 0,
+            "currentProtocol": PROTOCOL,
+            "timestamp": int(time.time()),
+            "txns": {"transactions": txns},
+        }
+
+    def fund(self, address, amount=INITIAL_BALANCE):
+        self.balances[address] = self.balances.get(address, 0) + amount
+
+    def advance(self, txns=()):
+        self.round += 1
+        self.blocks[self.round] = self._block(self.round, list(txns))
+
+    def submit(self, signed):
+        return self.submit_group([signed])
+
+    def submit_group(self, group):
+        """Commit the signed transactions in one block, all of them or
+        none; returns the first transaction ID."""
+        if len(group) > constants.tx_group_limit:
+            raise NodeError("group of {} transactions is over the limit of {}"
+                            .format(len(group), constants.tx_group_limit))
+        txns = [signed.transaction for signed in group]
+        if len(txns) > 1 or txns[0].group:
+            self._check_group(txns)
+        state = self._snapshot()
+        committed = []
+        try:
+            for signed in group:
+                txn, txid = self._check(signed)
+                if any(txid == c[1] for c in committed):
+                    raise NodeError("transaction repeated in group: " + txid)
+                committed.append((txn, txid, self._apply(txn)))
+        except Exception:
+            self._restore(state)
+            raise
+        self.advance()
+        for txn, txid, result in committed:
+            info = self.txn_json(txn, self.round, result)
+            self.blocks[self.round]["txns"]["transactions"].append(info)
+            self.txns[txid] = info
+        return committed[0][1]
+
+    def _check_group(self, txns):
+        bare = [copy.copy(txn) for txn in txns]
+        for txn in bare:
+            txn.group = None
+        gid = transaction.calculate_group_id(bare)
+        if any(txn.group != gid for txn in txns):
+            raise NodeError("transaction group is incomplete or its group "
+                            "ID does not match")
+
+    def _check(self, signed):
+        txn = signed.transaction
+        txid = txn.get_txid()
+        if txid in self.txns:
+            raise NodeError("transaction already in ledger: " + txid)
+        if txn.genesis_hash != self.genesis_hash:
+            raise NodeError("genesis hash mismatch")
+        if getattr(txn, "genesis_id", None) not in (None, "", GENESIS_ID):
+            raise NodeError("genesis ID mismatch")
+        if not txn.first_valid_round <= self.round + 1 <= \
+                txn.last_valid_round:
+            raise NodeError("txn dead: round {} outside of {}--{}".format(
+                self.round + 1, txn.first_valid_round, txn.last_valid_round))
+        if txn.fee < MIN_FEE:
+            raise NodeError("fee {} below minimum {}".format(txn.fee,
+                                                             MIN_FEE))
+        self._check_signature(signed)
+        return txn, txid
+
+    def _check_signature(self, signed):
+        txn = signed.transaction
+        if isinstance(signed, transaction.MultisigTransaction):
+            msig = signed.multisig
+            if msig.address() != txn.sender:
+                raise NodeError("multisig address does not match sender")
+            signers = [s for s in msig.subsigs if s.signature]
+            if len(signers) < msig.threshold:
+                raise NodeError("multisig below threshold")
+            for subsig in signers:
+                _verify(subsig.public_key, txn, subsig.signature)
+        else:
+            _verify(encoding.decode_address(txn.sender), txn,
+                    signed.signature)
+
+    def _debit(self, address, amount):
+        balance = self.balances.get(address, 0)
+        if balance < amount or balance - amount < MIN_BALANCE:
+            raise NodeError("overspend (account {}, balance {}, needed {})"
+                            .format(address, balance, amount))
+        self.balances[address] = balance - amount
+
+    def _holding(self, address, index):
+        holding = self.holdings.get((address, index))
+        if holding is None:
+            raise NodeError("account {} has not opted in to asset {}"
+                            .format(address, index))
+        return holding
+
+    def _asset(self, index):
+        if index not in self.assets:
+            raise NodeError("asset {} does not exist".format(index), 404)
+        return self.assets[index]
+
+    def _snapshot(self):
+        return (dict(self.balances),
+                {k: dict(v) for k, v in self.holdings.items()},
+                {k: dict(v) for k, v in self.assets.items()},
+                self.next_asset)
+
+    def _restore(self, state):
+        (self.balances, self.holdings, self.assets,
+         self.next_asset) = state
+
+    def _apply(self, txn):
+        # validate and mutate a scratch copy so rejected txns leave no trace
+        state = self._snapshot()
+        try:
+            self._debit(txn.sender, txn.fee)
+            handler = getattr(self, "_apply_" + txn.type, None)
+            if handler is None:
+                raise NodeError("unsupported transaction type " + txn.type)
+            return handler(txn)
+        except Exception:
+            self._restore(state)
+            raise
+
+    def _apply_pay(self, txn):
+        self._debit(txn.sender, txn.amt)
+        self.fund(txn.receiver, txn.amt)
+        close = getattr(txn, "close_remainder_to", None)
+        if close:
+            self.fund(close, self.balances.pop(txn.sender))
+        return {}
+
+    def _apply_keyreg(self, txn):
+        return {}
+
+    def _apply_acfg(self, txn):
+        index = getattr(txn, "index", None)
+        if not index:
+            index = self.next_asset
+            self.next_asset += 1
+            self.assets[index] = {
+                "creator": txn.sender,
+                "total": txn.total,
+                "decimals": getattr(txn, "decimals", 0) or 0,
+                "defaultfrozen": bool(txn.default_frozen),
+                "unitname": txn.unit_name or "",
+                "assetname": txn.asset_name or "",
+                "url": getattr(txn, "url", None) or "",
+                "metadatahash": getattr(txn, "metadata_hash", None),
+                "managerkey": txn.manager or "",
+                "reserveaddr": txn.reserve or "",
+                "freezeaddr": txn.freeze or "",
+                "clawbackaddr": txn.clawback or "",
+            }
+            self.holdings[(txn.sender, index)] = {
+                "creator": txn.sender, "amount": txn.total, "frozen": False}
+            return {"createdasset": index}
+        params = self._asset(index)
+        if txn.sender != params["managerkey"]:
+            raise NodeError("only the manager can reconfigure asset {}"
+                            .format(index))
+        if not (txn.manager or txn.reserve or txn.freeze or txn.clawback):
+            creator = params["creator"]
+            if self.holdings[(creator, index)]["amount"] != params["total"]:
+                raise NodeError("cannot destroy asset {} while units are "
+                                "outstanding".format(index))
+            del self.assets[index]
+            for key in [k for k in self.holdings if k[1] == index]:
+                del self.holdings[key]
+            return {}
+        params.update({
+            "managerkey": txn.manager or "",
+            "reserveaddr": txn.reserve or "",
+            "freezeaddr": txn.freeze or "",
+            "clawbackaddr": txn.clawback or "",
+        })
+        return {}
+
+    def _apply_axfer(self, txn):
+        index = txn.index
+        params = self._asset(index)
+        source = getattr(txn, "revocation_target", None)
+        if source:
+            if txn.sender != params["clawbackaddr"]:
+                raise NodeError("only the clawback address can revoke")
+        else:
+            source = txn.sender
+        if source == txn.receiver and not txn.amount and \
+                (source, index) not in self.holdings:
+            self.holdings[(source, index)] = {
+                "creator": params["creator"], "amount": 0,
+                "frozen": params["defaultfrozen"]}
+            return {}
+        sending = self._holding(source, index)
+        receiving = self._holding(txn.receiver, index)
+        if not getattr(txn, "revocation_target", None) and \
+                (sending["frozen"] or receiving["frozen"]):
+            raise NodeError("asset {} frozen".format(index))
+        if sending["amount"] < txn.amount:
+            raise NodeError("underflow on asset {}".format(index))
+        sending["amount"] -= txn.amount
+        receiving["amount"] += txn.amount
+        return {}
+
+    def _apply_afrz(self, txn):
+        params = self._asset(txn.index)
+        if txn.sender != params["freezeaddr"]:
+            raise NodeError("only the freeze address can freeze")
+        self._holding(txn.target, txn.index)["frozen"] = \
+            bool(txn.new_freeze_state)
+        return {}
+
+    def txn_json(self, txn, rnd, result=None):
+        info = {
+            "type": txn.type,
+            "tx": txn.get_txid(),
+            "from": txn.sender,
+            "fee": txn.fee,
+            "first-round": txn.first_valid_round,
+            "last-round": txn.last_valid_round,
+            "noteb64": base64.b64encode(txn.note).decode() if txn.note
+            else "",
+            "round": rnd,
+            "poolerror": "",
+            "genesisID": getattr(txn, "genesis_id", None) or "",
+            "genesishashb64": txn.genesis_hash,
+            "fromrewards": 0,
+        }
+        if txn.group:
+            info["group"] = base64.b64encode(txn.group).decode()
+        if txn.type == "pay":
+            info["payment"] = {
+                "to": txn.receiver, "amount": txn.amt,
+                "close": getattr(txn, "close_remainder_to", None) or "",
+                "torewards": 0, "closerewards": 0}
+        if txn.type == "acfg":
+            index = getattr(txn, "index", None) or \
+                (result or {}).get("createdasset")
+            info["curcfg"] = {"id": index,
+                              "params": dict(self.assets.get(index, {}))}
+        if result:
+            info["txresults"] = result
+        return info
+
+    def account_json(self, address):
+        assets = {str(i): dict(h) for (a, i), h in self.holdings.items()
+                  if a == address}
+        info = {
+            "round": self.round,
+            "address": address,
+            "amount": self.balances.get(address, 0),
+            "amountwithoutpendingrewards": self.balances.get(address, 0),
+            "pendingrewards": 0,
+            "rewards": 0,
+            "status": "Offline",
+        }
+        if assets:
+            info["assets"] = assets
+        created = {str(i): dict(p) for i, p in self.assets.items()
+                   if p["creator"] == address}
+        if created:
+            info["thisassettotal"] = created
+        return info
+
+
+class Wallet:
+    def __init__(self, name, password, wallet_id):
+        self.id = wallet_id
+        self.name = name
+        self.password = password
+        self.mdk = _seed(b"mdk", wallet_id.encode())
+        self.derived = 0
+        self.keys = {}
+        self.multisigs = {}
+
+    def json(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "driver_name": "sqlite",
+            "driver_version": 1,
+            "mnemonic_ux": False,
+            "supported_txs": ["pay", "keyreg"],
+        }
+
+    def generate(self):
+        self.derived += 1
+        sk = _private_key(_seed(self.mdk, str(self.derived).encode()))
+        return self.add(sk)
+
+    def add(self, private_key):
+        address = _address(private_key)
+        self.keys[address] = private_key
+        return address
+
+
+class FakeNode:
+    """The ledger and kmd state, plus the two HTTP servers serving them."""
+
+    def __init__(self, host="127.0.0.1"):
+        self.host = host
+        self.lock = threading.Lock()
+        self.ledger = Ledger()
+        self.wallets = {}
+        self.handles = {}
+        default = self.create_wallet(DEFAULT_WALLET, "")
+        for _ in range(DEFAULT_WALLET_KEYS):
+            self.ledger.fund(default.generate())
+        self.servers = []
+
+    def create_wallet(self, name, password):
+        if any(w.name == name for w in self.wallets.values()):
+            raise NodeError("wallet with same name already exists")
+        wallet_id = hashlib.sha256(name.encode()).hexdigest()[:32]
+        self.wallets[wallet_id] = Wallet(name, password, wallet_id)
+        return self.wallets[wallet_id]
+
+    def start(self):
+        for api in (AlgodAPI(self), KMDAPI(self)):
+            server = ThreadingHTTPServer((self.host, 0), _handler(api))
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever,
+                             daemon=True).start()
+            self.servers.append(server)
+        return self
+
+    def stop(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+        self.servers = []
+
+    @property
+    def algod_address(self):
+        return "{}:{}".format(*self.servers[0].server_address)
+
+    @property
+    def kmd_address(self):
+        return "{}:{}".format(*self.servers[1].server_address)
+
+    def write_data_dir(self, path):
+        """Lay out token and net files the way `goal network` does."""
+        kmd_dir = os.path.join(path, KMD_DIR)
+        os.makedirs(kmd_dir, exist_ok=True)
+        for directory, address in ((path, self.algod_address),
+                                   (kmd_dir, self.kmd_address)):
+            name = "kmd" if directory == kmd_dir else "algod"
+            with open(os.path.join(directory, name + ".net"), "w") as f:
+                f.write(address + "\n")
+            with open(os.path.join(directory, name + ".token"), "w") as f:
+                f.write(TOKEN + "\n")
+
+
+class AlgodAPI:
+    def __init__(self, node):
+        self.node = node
+        self.ledger = node.ledger
+
+    def route(self, method, parts, query, body):
+        ledger = self.ledger
+        if parts == ["health"]:
+            return None
+        if parts == ["versions"]:
+            return {"versions": ["v1"], "genesis_id": GENESIS_ID,
+                    "genesis_hash_b64": ledger.genesis_hash,
+                    "build": {"major": 0, "minor": 0, "build_number": 0,
+                              "commit_hash": "", "branch": "fakenode",
+                              "channel": "dev"}}
+        if parts == ["status"]:
+            return self.status()
+        if parts[:2] == ["status", "wait-for-block-after"]:
+            rnd = int(parts[2])
+            while ledger.round <= rnd:
+                ledger.advance()
+            return self.status()
+        if parts[0] == "block":
+            rnd = int(parts[1])
+            if rnd not in ledger.blocks:
+                raise NodeError("no block for round {}".format(rnd), 404)
+            return ledger.blocks[rnd]
+        if parts == ["ledger", "supply"]:
+            total = sum(ledger.balances.values())
+            return {"round": ledger.round, "totalMoney": total,
+                    "onlineMoney": total}
+        if parts == ["transactions", "params"]:
+            return {"fee": 1, "genesisID": GENESIS_ID,
+                    "genesishashb64": ledger.genesis_hash,
+                    "lastRound": ledger.round, "consensusVersion": PROTOCOL}
+        if parts == ["transactions", "fee"]:
+            return {"fee": 1}
+        if parts == ["transactions"] and method == "POST":
+            return {"txId": ledger.submit_group(_signed_txns(body))}
+        if parts == ["transactions", "pending"]:
+            return {"truncatedTxns": {"transactions": []}, "totalTxns": 0}
+        if parts[:2] == ["transactions", "pending"]:
+            return self.txn(parts[2])
+        if parts[0] == "transaction":
+            return self.txn(parts[1])
+        if parts[0] == "account" and len(parts) == 2:
+            return ledger.account_json(parts[1])
+        if parts[0] == "account" and parts[2] == "transaction":
+            info = self.txn(parts[3])
+            if parts[1] not in (info["from"],
+                                info.get("payment", {}).get("to")):
+                raise NodeError("transaction not found for account", 404)
+            return info
+        if parts[0] == "account" and parts[2] == "transactions":
+            return self.history(parts[1], query)
+        if parts == ["assets"]:
+            start = int(query.get("assetIdx", 0))
+            limit = int(query.get("max", 100)) or 100
+            indices = sorted(i for i in ledger.assets if i > start)[:limit]
+            return {"assets": [{"AssetIndex": i,
+                                "AssetParams": ledger.assets[i]}
+                               for i in indices]}
+        if parts[0] == "asset":
+            return self.ledger._asset(int(parts[1]))
+        raise NodeError("unknown endpoint", 404)
+
+    def status(self):
+        return {"lastRound": self.ledger.round,
+                "lastConsensusVersion": PROTOCOL,
+                "nextConsensusVersion": PROTOCOL,
+                "nextConsensusVersionRound": self.ledger.round + 1,
+                "nextConsensusVersionSupported": True,
+                "timeSinceLastRound": 0, "catchupTime": 0}
+
+    def txn(self, txid):
+        if txid not in self.ledger.txns:
+            raise NodeError("transaction {} not found".format(txid), 404)
+        return self.ledger.txns[txid]
+
+    def history(self, address, query):
+        first = int(query.get("firstRound", 1))
+        last = int(query.get("lastRound", self.ledger.round))
+        limit = int(query.get("max", 0))
+        dates = (query.get("fromDate"), query.get("toDate"))
+        txns = []
+        for rnd in range(last, first - 1, -1):
+            block = self.ledger.blocks.get(rnd)
+            if block is None:
+                continue
+            day = datetime.fromtimestamp(block["timestamp"]) \
+                .strftime("%Y-%m-%d")
+            if dates[0] and not dates[0] <= day <= (dates[1] or day):
+                continue
+            txns.extend(t for t in block["txns"]["transactions"]
+                        if address in (t["from"],
+                                       t.get("payment", {}).get("to")))
+        if limit:
+            txns = txns[:limit]
+        return {"transactions": txns} if txns else {}
+
+
+class KMDAPI:
+    def __init__(self, node):
+        self.node = node
+
+    def wallet(self, body, password=False):
+        handle = self.node.handles.get(body.get("wallet_handle_token"))
+        if handle is None:
+            raise NodeError("invalid wallet handle")
+        wallet = self.node.wallets[handle]
+        if password and body.get("wallet_password", "") != wallet.password:
+            raise NodeError("wrong password")
+        return wallet
+
+    def route(self, method, parts, query, body):
+        node = self.node
+        path = "/".join(parts)
+        if path == "versions":
+            return {"versions": ["v1"]}
+        if path == "wallets":
+            return {"wallets": [w.json() for w in node.wallets.values()]}
+        if path == "wallet":
+            wallet = node.create_wallet(body["wallet_name"],
+                                        body.get("wallet_password", ""))
+            return {"wallet": wallet.json()}
+        if path == "wallet/init":
+            wallet = node.wallets.get(body["wallet_id"])
+            if wallet is None or \
+                    body.get("wallet_password", "") != wallet.password:
+                raise NodeError("wallet not found or wrong password")
+            token = hashlib.sha256("{}/{}".format(
+                wallet.id, len(node.handles)).encode()).hexdigest()
+            node.handles[token] = wallet.id
+            return {"wallet_handle_token": token}
+        if path in ("wallet/info", "wallet/renew"):
+            return {"wallet_handle": {"wallet": self.wallet(body).json(),
+                                      "expires_seconds": 60}}
+        if path == "wallet/release":
+            self.wallet(body)
+            del node.handles[body["wallet_handle_token"]]
+            return {}
+        if path == "wallet/rename":
+            wallet = node.wallets[body["wallet_id"]]
+            if body.get("wallet_password", "") != wallet.password:
+                raise NodeError("wrong password")
+            wallet.name = body["wallet_name"]
+            return {"wallet": wallet.json()}
+        if path == "master-key/export":
+            wallet = self.wallet(body, password=True)
+            return {"master_derivation_key":
+                    base64.b64encode(wallet.mdk).decode()}
+        if path == "key" and method == "POST":
+            return {"address": self.wallet(body).generate()}
+        if path == "key" and method == "DELETE":
+            self.wallet(body, password=True).keys.pop(body["address"], None)
+            return {}
+        if path == "key/import":
+            return {"address": self.wallet(body).add(body["private_key"])}
+        if path == "key/export":
+            wallet = self.wallet(body, password=True)
+            if body["address"] not in wallet.keys:
+                raise NodeError("key does not exist in this wallet")
+            return {"private_key": wallet.keys[body["address"]]}
+        if path == "key/list":
+            return {"addresses": list(self.wallet(body).keys)}
+        if path == "transaction/sign":
+            wallet = self.wallet(body, password=True)
+            txn = encoding.msgpack_decode(body["transaction"])
+            if txn.sender not in wallet.keys:
+                raise NodeError("key does not exist in this wallet")
+            return {"signed_transaction": encoding.msgpack_encode(
+                txn.sign(wallet.keys[txn.sender]))}
+        if path == "multisig/list":
+            return {"addresses": list(self.wallet(body).multisigs)}
+        if path == "multisig/import":
+            msig = transaction.Multisig(
+                body["multisig_version"], body["threshold"],
+                [encoding.encode_address(base64.b64decode(pk))
+                 for pk in body["pks"]])
+            self.wallet(body).multisigs[msig.address()] = body
+            return {"address": msig.address()}
+        if path == "multisig/export":
+            imported = self.wallet(body).multisigs.get(body["address"])
+            if imported is None:
+                raise NodeError("multisig does not exist in this wallet")
+            return {key: imported[key]
+                    for key in ("multisig_version", "threshold", "pks")}
+        if path == "multisig" and method == "DELETE":
+            self.wallet(body, password=True).multisigs.pop(body["address"],
+                                                           None)
+            return {}
+        if path == "multisig/sign":
+            return {"multisig": self.sign_multisig(body)}
+        raise NodeError("unknown endpoint", 404)
+
+    def sign_multisig(self, body):
+        wallet = self.wallet(body, password=True)
+        partial = body["partial_multisig"]
+        if "subsig" in partial:
+            # SDK versions sending the msgpack field names
+            partial = {"Version": partial["v"], "Threshold": partial["thr"],
+                       "Subsigs": [{"Key": s["pk"], "Sig": s.get("s")}
+                                   for s in partial["subsig"]]}
+        subsigs = partial["Subsigs"]
+        msig = transaction.Multisig(
+            partial["Version"], partial["Threshold"],
+            [encoding.encode_address(base64.b64decode(s["Key"]))
+             for s in subsigs])
+        for subsig, existing in zip(msig.subsigs, subsigs):
+            if existing.get("Sig"):
+                subsig.signature = base64.b64decode(existing["Sig"])
+        signer = encoding.encode_address(base64.b64decode(body["public_key"]))
+        if signer not in wallet.keys:
+            raise NodeError("key does not exist in this wallet")
+        mtx = transaction.MultisigTransaction(
+            encoding.msgpack_decode(body["transaction"]), msig)
+        mtx.sign(wallet.keys[signer])
+        return encoding.msgpack_encode(mtx.multisig)
+
+
+def _handler(api):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # headers and body go out in separate writes; on a keep-alive
+        # connection Nagle would hold the body back for the client's
+        # delayed ACK, about 40ms per response
+        disable_nagle_algorithm = True
+
+        def _serve(self):
+            url = urlparse(self.path)
+            parts = [p for p in url.path.split("/") if p]
+            if parts[:1] == ["v1"]:
+                parts = parts[1:]
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            if isinstance(api, KMDAPI):
+                body = json.loads(body.decode()) if body else {}
+            try:
+                with api.node.lock:
+                    result = api.route(self.command, parts or [""], query,
+                                       body)
+                status = 200
+            except NodeError as e:
+                result = {"error": True, "message": str(e)}
+                status = e.status
+            except Exception as e:
+                result = {"error": True, "message": repr(e)}
+                status = 400
+            payload = json.dumps(result).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = do_POST = do_DELETE = _serve
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main(argv):
+    if len(argv) != 2:
+        sys.exit("usage: python -m harness.fakenode DATA_DIR")
+    node = FakeNode().start()
+    node.write_data_dir(argv[1])
+    sys.stdout.write("algod on {}, kmd on {}\n".format(node.algod_address,
+                                                       node.kmd_address))
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        node.stop()
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,58 @@
+"""Fast-start mode (FAST_START=1): deferred imports and a pruning step
+matcher, for runs of a single feature or scenario.
+
+module(name) returns a stand-in for the module that imports it the first
+time one of its attributes is used, so the SDK and the heavier harness
+modules are only loaded by the steps that need them. Without FAST_START
+it imports the module right away.
+
+PrefixParseMatcher is behave's "parse" step matcher with the literal text
+in front of a pattern's first field as a cheap pre-check: a step is only
+parsed by the definitions whose prefix it starts with.
+"""
+import importlib
+import os
+import types
+
+from behave import matchers
+
+ENABLED = bool(os.environ.get("FAST_START"))
+MATCHER = "prefix"
+
+
+class _Deferred(types.ModuleType):
+    def __getattr__(self, attr):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def module(name):
+    if not ENABLED:
+        return importlib.import_module(name)
+    return _Deferred(name)
+
+
+class PrefixParseMatcher(matchers.ParseMatcher):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # parse patterns may be case-insensitive, so compare folded text
+        self.prefix = self.pattern.split("{", 1)[0].lower()
+
+    def compile(self):
+        # behave 1.3 compiles every definition when it is registered, to
+        # check it; leave that to the parser's first use. Older versions
+        # never call this.
+        return self
+
+    def check_match(self, step_text):
+        if not step_text.lower().startswith(self.prefix):
+            return None
+        return super().check_match(step_text)
+
+
+if hasattr(matchers, "register_step_matcher_class"):
+    matchers.register_step_matcher_class(MATCHER, PrefixParseMatcher,
+                                         override=True)
+else:
+    matchers.matcher_mapping[MATCHER] = PrefixParseMatcher
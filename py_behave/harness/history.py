@@ -0,0 +1,84 @@
+"""Paginated, resumable walk over an account's transaction history."""
+import json
+import os
+
+
+class TruncatedHistory(Exception):
+    """A round holds more of the account's transactions than the node
+    returns in one response."""
+
+
+class Checkpoint:
+    """The last round whose transactions have all been yielded, optionally
+    persisted to a JSON file so an interrupted walk can resume."""
+
+    def __init__(self, path=None, round=0):
+        self.path = path
+        self.round = round
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.round = json.load(f)["round"]
+
+    def advance(self, rnd):
+        self.round = rnd
+        if self.path:
+            with open(self.path, "w") as f:
+                json.dump({"round": rnd}, f)
+
+
+def _round(acl, address, rnd, txns, limit):
+    # the API can't page within a round, so ask for more until a response
+    # comes back short
+    while len(txns) >= limit:
+        limit *= 2
+        page = acl.transactions_by_address(address, first=rnd, last=rnd,
+                                           limit=limit)
+        more = page.get("transactions", []) if page else []
+        if len(more) <= len(txns):
+            raise TruncatedHistory(
+                "round {} holds more than the {} transactions of {} the "
+                "node returns".format(rnd, len(txns), address))
+        txns = more
+    return txns
+
+
+def transactions(acl, address, first=1, last=None, window=None,
+                 page_size=None, checkpoint=None):
+    """Lazily yield the transactions of `address` between rounds first and
+    last (default: the current round), oldest first.
+
+    Rounds are requested `window` at a time (default HISTORY_WINDOW or
+    1000), asking for at most `page_size` transactions per request
+    (default HISTORY_PAGE_SIZE or 500); a window that fills a page is split
+    in half until every request fits, so no response is larger than one
+    page. A single round that fills a page is requested again with larger
+    limits until it is complete, and TruncatedHistory is raised if the
+    node will not return all of it. With a Checkpoint, the walk starts
+    after its round and advances it as each window is finished.
+    """
+    if window is None:
+        window = int(os.environ.get("HISTORY_WINDOW", 1000))
+    if page_size is None:
+        page_size = int(os.environ.get("HISTORY_PAGE_SIZE", 500))
+    if last is None:
+        last = acl.status()["lastRound"]
+    if checkpoint is not None:
+        first = max(first, checkpoint.round + 1)
+    lo = first
+    while lo <= last:
+        hi = min(lo + window - 1, last)
+        while True:
+            page = acl.transactions_by_address(address, first=lo, last=hi,
+                                               limit=page_size)
+            txns = page.get("transactions", []) if page else []
+            if len(txns) < page_size:
+                break
+            if hi == lo:
+                txns = _round(acl, address, lo, txns, page_size)
+                break
+            hi = lo + (hi - lo) // 2
+        for txn in sorted(txns, key=lambda t: t.get("round", 0)):
+            yield txn
+        if checkpoint is not None:
+            checkpoint.advance(hi)
+        lo = hi + 1
@@ -0,0 +1,114 @@
+"""Batched kmd key and multisig operations with local membership sets.
+
+KeyRing wraps a wallet.Wallet and keeps the sets of its key and multisig
+addresses, listed from kmd once and then updated by every generate,
+import and delete made through the KeyRing, so membership checks never
+re-list the wallet. The batch methods run many kmd calls on one wallet
+handle (renewed every `chunk` calls) across a thread pool, instead of one
+Wallet call, with its own handle renewal, at a time.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+
+class KeyRing:
+    def __init__(self, wallet, keys=None, workers=8, chunk=256):
+        self.wallet = wallet
+        self.kcl = wallet.kcl
+        self._keys = set(keys) if keys is not None else None
+        self._multisigs = None
+        self.workers = workers
+        self.chunk = chunk
+
+    @property
+    def keys(self):
+        if self._keys is None:
+            self._keys = set(self.wallet.list_keys())
+        return self._keys
+
+    @property
+    def multisigs(self):
+        if self._multisigs is None:
+            self._multisigs = set(self.wallet.list_multisig())
+        return self._multisigs
+
+    def has_key(self, address):
+        return address in self.keys
+
+    def has_multisig(self, address):
+        return address in self.multisigs
+
+    def _handle(self):
+        self.wallet.automate_handle()
+        return self.wallet.handle
+
+    def _map(self, fn, items):
+        """fn(handle, item) for every item, in order."""
+        items = list(items)
+        if len(items) == 1:
+            return [fn(self._handle(), items[0])]
+        results = []
+        with ThreadPoolExecutor(self.workers) as pool:
+            for i in range(0, len(items), self.chunk):
+                handle = self._handle()
+                results.extend(pool.map(lambda item: fn(handle, item),
+                                        items[i:i + self.chunk]))
+        return results
+
+    def generate_keys(self, count):
+        addresses = self._map(
+            lambda h, _: self.kcl.generate_key(h, display_mnemonic=False),
+            range(count))
+        self.keys.update(addresses)
+        return addresses
+
+    def import_keys(self, private_keys):
+        addresses = self._map(self.kcl.import_key, private_keys)
+        self.keys.update(addresses)
+        return addresses
+
+    def export_keys(self, addresses):
+        pswd = self.wallet.pswd
+        return self._map(lambda h, a: self.kcl.export_key(h, pswd, a),
+                         addresses)
+
+    def delete_keys(self, addresses):
+        pswd = self.wallet.pswd
+        addresses = list(addresses)
+        self._map(lambda h, a: self.kcl.delete_key(h, pswd, a), addresses)
+        self.keys.difference_update(addresses)
+
+    def import_multisigs(self, multisigs):
+        addresses = self._map(self.kcl.import_multisig, multisigs)
+        self.multisigs.update(addresses)
+        return addresses
+
+    def export_multisigs(self, addresses):
+        return self._map(self.kcl.export_multisig, addresses)
+
+    def delete_multisigs(self, addresses):
+        pswd = self.wallet.pswd
+        addresses = list(addresses)
+        self._map(lambda h, a: self.kcl.delete_multisig(h, pswd, a),
+                  addresses)
+        self.multisigs.difference_update(addresses)
+
+    def generate_key(self):
+        return self.generate_keys(1)[0]
+
+    def import_key(self, private_key):
+        return self.import_keys([private_key])[0]
+
+    def export_key(self, address):
+        return self.export_keys([address])[0]
+
+    def delete_key(self, address):
+        self.delete_keys([address])
+
+    def import_multisig(self, multisig):
+        return self.import_multisigs([multisig])[0]
+
+    def export_multisig(self, address):
+        return self.export_multisigs([address])[0]
+
+    def delete_multisig(self, address):
+        self.delete_multisigs([address])
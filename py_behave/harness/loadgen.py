@@ -0,0 +1,266 @@
+"""Transaction throughput load generator.
+
+    python -m harness.loadgen --txns 5000 --rate 200 [--asset-ratio 0.5]
+
+Builds payments (and optionally asset transfers) between the accounts of a
+kmd wallet the same way the default_txn and transfer_assets steps do, signs
+them locally and submits them at a target rate from a pool of sender
+threads. At most --inflight transactions are submitted but unconfirmed at
+any time. Confirmations are read from new blocks as they are produced, and
+the run reports submitted and confirmed TPS, confirmation latency
+percentiles and the reasons transactions were rejected. A transaction
+still pending once the node is past its last valid round is counted as
+expired and frees its slot; if no slot frees up within --timeout,
+submission stops and the run is reported as stalled.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from algosdk import transaction
+from algosdk import wallet
+
+from harness import assets
+from harness import clients
+from harness import DEFAULT_WALLET
+from harness.waiter import ConfirmationWaiter
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) -
+                                                             1))))]
+
+
+def _reason(e):
+    # the SDK's algod errors carry the node's whole JSON error body
+    message = str(e)
+    try:
+        message = json.loads(message)["message"]
+    except (ValueError, KeyError, TypeError):
+        pass
+    # strip txids and addresses so identical failures are counted together
+    return message.split(":")[0].strip()[:80]
+
+
+class LoadGenerator:
+    """Drives `count` transactions through `acl` from `accounts`, a list of
+    (address, private key) pairs with at least two entries."""
+
+    def __init__(self, acl, accounts, rate=100, inflight=500, senders=8,
+                 asset_index=None, asset_ratio=0.0, timeout=60):
+        self.acl = acl
+        self.accounts = accounts
+        self.rate = rate
+        self.senders = senders
+        self.asset_index = asset_index
+        self.asset_ratio = asset_ratio if asset_index else 0.0
+        self.timeout = timeout
+        self.slots = threading.BoundedSemaphore(inflight)
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.latencies = []
+        self.rejected = Counter()
+        self.submitted = 0
+        self.expired = 0
+        self.stalled = False
+        self.done = threading.Event()
+
+    def txns(self, count):
+        """Lazily build and sign `count` transactions."""
+        params = self.acl.suggested_params()
+        last_round = params["lastRound"]
+        for i in range(count):
+            sender, sk = self.accounts[i % len(self.accounts)]
+            receiver = self.accounts[(i + 1) % len(self.accounts)][0]
+            # the note keeps otherwise identical transactions distinct
+            note = "load-{}-{}".format(os.getpid(), i).encode()
+            # an asset transfer whenever the running share of them falls
+            # behind asset_ratio, so any ratio is met to within one txn
+            if math.floor((i + 1) * self.asset_ratio) > \
+                    math.floor(i * self.asset_ratio):
+                txn = transaction.AssetTransferTxn(
+                    sender, params["fee"], last_round, last_round + 1000,
+                    params["genesishashb64"], receiver, 1, self.asset_index,
+                    note=note)
+            else:
+                txn = transaction.PaymentTxn(
+                    sender, params["fee"], last_round, last_round + 1000,
+                    params["genesishashb64"], receiver, 1, note=note,
+                    gen=params["genesisID"])
+            yield txn.sign(sk)
+
+    def _send(self, stx):
+        txid = stx.transaction.get_txid()
+        with self.lock:
+            self.pending[txid] = (time.monotonic(),
+                                  stx.transaction.last_valid_round)
+        try:
+            self.acl.send_transaction(stx)
+        except Exception as e:
+            with self.lock:
+                self.rejected[_reason(e)] += 1
+                if self.pending.pop(txid, None) is None:
+                    return
+            self.slots.release()
+
+    def _expire(self, rnd):
+        """Give up on pending transactions that can no longer be committed
+        after round rnd, freeing their slots."""
+        with self.lock:
+            expired = [txid for txid, (_, last_valid) in self.pending.items()
+                       if last_valid <= rnd]
+            for txid in expired:
+                del self.pending[txid]
+            self.expired += len(expired)
+        for _ in expired:
+            self.slots.release()
+
+    def _track(self, first_round):
+        rnd = first_round
+        while not self.done.is_set() or self.pending:
+            try:
+                self.acl.status_after_block(rnd)
+                last = self.acl.status()["lastRound"]
+                while rnd < last:
+                    block = self.acl.block_info(rnd + 1)
+                    rnd += 1
+                    now = time.monotonic()
+                    txns = (block.get("txns") or {}).get("transactions", [])
+                    for txn in txns:
+                        with self.lock:
+                            sent = self.pending.pop(txn["tx"], None)
+                        if sent is not None:
+                            self.latencies.append(now - sent[0])
+                            self.slots.release()
+                    # accepted but dropped from the pool, or never picked
+                    # up before its last valid round
+                    self._expire(rnd)
+            except Exception as e:
+                # a slow or flaky node must not stall the senders
+                self.rejected["tracker: " + _reason(e)] += 1
+                time.sleep(1)
+            if self.done.is_set() and time.monotonic() > self.deadline:
+                break
+
+    def run(self, count):
+        tracker = threading.Thread(
+            target=self._track, args=(self.acl.status()["lastRound"],),
+            daemon=True)
+        tracker.start()
+        start = time.monotonic()
+        with ThreadPoolExecutor(self.senders) as pool:
+            for i, stx in enumerate(self.txns(count)):
+                delay = start + i / self.rate - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                # every slot held by a transaction that is neither
+                # committed nor expired means the node stopped committing
+                if not self.slots.acquire(timeout=self.timeout):
+                    self.stalled = True
+                    break
+                self.submitted += 1
+                pool.submit(self._send, stx)
+        submit_time = time.monotonic() - start
+        self.deadline = time.monotonic() + self.timeout
+        self.done.set()
+        tracker.join()
+        total_time = time.monotonic() - start
+        confirmed = len(self.latencies)
+        return {
+            "submitted": self.submitted,
+            "confirmed": confirmed,
+            "unconfirmed": len(self.pending),
+            "expired": self.expired,
+            "stalled": self.stalled,
+            "rejected": dict(self.rejected),
+            "submitted_tps": self.submitted / submit_time if submit_time
+            else None,
+            "confirmed_tps": confirmed / total_time if total_time else None,
+            "latency": {"p50": percentile(self.latencies, 50),
+                        "p90": percentile(self.latencies, 90),
+                        "p99": percentile(self.latencies, 99),
+                        "max": max(self.latencies, default=None)},
+        }
+
+
+def setup_asset(acl, accounts, waiter, name="load", amount=10 ** 12):
+    """Create an asset held by the first account, opt every other account
+    in to it and send each of them `amount`; returns the asset index."""
+    creator, sk = accounts[0]
+    params = acl.suggested_params()
+    last_round = params["lastRound"]
+    txn = transaction.AssetConfigTxn(
+        creator, params["fee"], last_round, last_round + 1000,
+        params["genesishashb64"], total=10 ** 15, default_frozen=False,
+        unit_name=name, asset_name=name, manager=creator,
+        reserve=creator, freeze=creator, clawback=creator)
+    info = waiter.confirm(acl, acl.send_transaction(txn.sign(sk)))
+    index = assets.created(acl, info)
+    txids = []
+    for address, key in accounts[1:]:
+        txn = transaction.AssetTransferTxn(
+            address, params["fee"], last_round, last_round + 1000,
+            params["genesishashb64"], address, 0, index)
+        txids.append(acl.send_transaction(txn.sign(key)))
+    for txid in txids:
+        waiter.confirm(acl, txid)
+    # by default enough that transfers back to the creator never underflow
+    txids = []
+    for address, _ in accounts[1:]:
+        txn = transaction.AssetTransferTxn(
+            creator, params["fee"], last_round, last_round + 1000,
+            params["genesishashb64"], address, amount, index)
+        txids.append(acl.send_transaction(txn.sign(sk)))
+    for txid in txids:
+        waiter.confirm(acl, txid)
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--txns", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=100,
+                        help="target submissions per second")
+    parser.add_argument("--inflight", type=int, default=500,
+                        help="max submitted but unconfirmed transactions")
+    parser.add_argument("--senders", type=int, default=8,
+                        help="concurrent submission threads")
+    parser.add_argument("--asset-ratio", type=float, default=0.0,
+                        help="fraction of transactions that are asset "
+                             "transfers")
+    parser.add_argument("--wallet", default=DEFAULT_WALLET)
+    parser.add_argument("--timeout", type=float, default=60,
+                        help="seconds to wait for confirmations after the "
+                             "last submission, or for a free inflight slot")
+    parser.add_argument("--report", help="write the report as JSON here")
+    args = parser.parse_args(argv)
+
+    acl = clients.algod_client()
+    w = wallet.Wallet(args.wallet, "", clients.kmd_client())
+    accounts = [(a, w.export_key(a)) for a in w.list_keys()]
+    if len(accounts) < 2:
+        sys.exit("wallet {} needs at least two accounts".format(args.wallet))
+    index = None
+    if args.asset_ratio:
+        index = setup_asset(acl, accounts, ConfirmationWaiter.from_env())
+    gen = LoadGenerator(acl, accounts, args.rate, args.inflight,
+                        args.senders, index, args.asset_ratio, args.timeout)
+    report = gen.run(args.txns)
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Per-scenario and per-step memory profiling with tracemalloc.
+
+A scenario is traced when MEMORY_PROFILE names a report file, or when it
+or its feature is tagged with a budget such as @memory_budget_64MB (a
+number of bytes, or of KB, MB or GB). Tracing starts with the scenario
+and stops after it, so its peak is the most memory the scenario's own
+allocations held at any one time. Every step records its own peak. With
+MEMORY_PROFILE it also records the MEMORY_PROFILE_TOP (default 5) source
+lines holding the most memory allocated during the step when the step
+ends. A step that takes the scenario's peak over its budget fails.
+"""
+import os
+import re
+import tracemalloc
+
+_BUDGET = re.compile(r"memory_budget_(\d+)(KB|MB|GB)?$", re.IGNORECASE)
+_UNITS = {None: 1, "KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+_FILTERS = [tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")]
+
+
+class MemoryBudgetExceeded(AssertionError):
+    """A scenario's peak traced memory went over its @memory_budget tag."""
+
+
+def budget(tags):
+    """The smallest budget in bytes among the tags, or None."""
+    budgets = []
+    for tag in tags:
+        match = _BUDGET.match(tag)
+        if match:
+            unit = match.group(2) and match.group(2).upper()
+            budgets.append(int(match.group(1)) * _UNITS[unit])
+    return min(budgets) if budgets else None
+
+
+def _mb(n):
+    return n / (1 << 20)
+
+
+def _human(n):
+    if n < 1 << 20:
+        return "{:.1f} KB".format(n / (1 << 10))
+    return "{:.1f} MB".format(_mb(n))
+
+
+class MemoryProfiler:
+    def __init__(self, report=False, top=5):
+        self.report = report
+        self.top = top
+        self.scenarios = {}
+        self.current = None
+        self.budget = None
+        self.snapshot = None
+        self.overhead = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(bool(os.environ.get("MEMORY_PROFILE")),
+                   int(os.environ.get("MEMORY_PROFILE_TOP", 5)))
+
+    def start_scenario(self, name, tags):
+        self.budget = budget(tags)
+        self.current = None
+        if not self.report and self.budget is None:
+            return
+        self.current = {"budget": self.budget, "peak": 0, "steps": []}
+        if self.report:
+            self.scenarios[name] = self.current
+        tracemalloc.start()
+
+    def start_step(self):
+        if self.current is None:
+            return
+        if self.report:
+            # the snapshot is traced too, so leave it out of the step's
+            # figures
+            size = tracemalloc.get_traced_memory()[0]
+            self.snapshot = tracemalloc.take_snapshot().filter_traces(
+                _FILTERS)
+            self.overhead = tracemalloc.get_traced_memory()[0] - size
+        # before Python 3.9 the peak can't be reset, so a step's peak is
+        # the scenario's peak so far
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+
+    def end_step(self, name):
+        """Record the step; raises MemoryBudgetExceeded if the scenario's
+        peak is now over budget."""
+        if self.current is None:
+            return
+        size, peak = tracemalloc.get_traced_memory()
+        size, peak = size - self.overhead, peak - self.overhead
+        step = {"step": name, "peak": peak, "retained": size}
+        if self.report:
+            stats = tracemalloc.take_snapshot().filter_traces(
+                _FILTERS).compare_to(self.snapshot, "lineno")
+            step["top"] = [
+                {"site": "{}:{}".format(s.traceback[0].filename,
+                                        s.traceback[0].lineno),
+                 "size": s.size_diff, "count": s.count_diff}
+                for s in stats[:self.top] if s.size_diff > 0]
+            self.snapshot, self.overhead = None, 0
+        self.current["steps"].append(step)
+        self.current["peak"] = max(self.current["peak"], peak)
+        if self.budget is not None and peak > self.budget:
+            raise MemoryBudgetExceeded(
+                "peak traced memory {} during this step is over the "
+                "scenario's {} budget".format(_human(peak),
+                                              _human(self.budget)))
+
+    def end_scenario(self):
+        if self.current is not None:
+            tracemalloc.stop()
+        self.current = None
+
+    def summary(self):
+        """(scenario, peak MB, budget MB or None) for every profiled
+        scenario."""
+        return [(name, _mb(s["peak"]),
+                 _mb(s["budget"]) if s["budget"] is not None else None)
+                for name, s in self.scenarios.items()]
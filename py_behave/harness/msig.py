@@ -0,0 +1,113 @@
+"""Incremental aggregation of partially signed multisig transactions.
+
+MultisigAggregator collects partial MultisigTransactions from any number
+of co-signers, keyed by txid, merging each partial's signatures into the
+one pending transaction for that txid as it arrives, and hands back the
+fully signed transaction as soon as it has `threshold` signatures. It
+makes the same consistency checks as MultisigTransaction.merge (the same
+multisig, no conflicting signatures), but compares the multisig's keys
+instead of recomputing its address for every partial, and with
+add_encoded it reads a partial's txid and signatures from its msgpack
+encoding, so only the first partial of each transaction is decoded into
+SDK objects.
+"""
+import base64
+import copy
+
+import msgpack
+
+from algosdk import constants
+from algosdk import encoding
+from algosdk import error
+from algosdk import transaction
+
+
+def txid(txn_fields):
+    """The txid of a transaction from its decoded msgpack fields, as
+    Transaction.get_txid computes it from the object."""
+    data = constants.txid_prefix + msgpack.packb(txn_fields,
+                                                 use_bin_type=True)
+    return base64.b32encode(encoding.checksum(data)).decode().strip("=")
+
+
+class _Pending:
+    def __init__(self, mtx):
+        msig = mtx.multisig
+        self.mtx = mtx
+        self.keys = (msig.version, msig.threshold,
+                     tuple(s.public_key for s in msig.subsigs))
+        self.signed = sum(1 for s in msig.subsigs if s.signature)
+
+    def merge(self, keys, signatures):
+        if keys != self.keys:
+            raise error.MergeKeysMismatchError
+        subsigs = self.mtx.multisig.subsigs
+        for subsig, sig in zip(subsigs, signatures):
+            if not sig:
+                continue
+            if not subsig.signature:
+                subsig.signature = sig
+                self.signed += 1
+            elif subsig.signature != sig:
+                raise error.DuplicateSigMismatchError
+
+    @property
+    def complete(self):
+        return self.signed >= self.keys[1]
+
+
+class MultisigAggregator:
+    def __init__(self):
+        self.pending = {}
+        self.completed = set()
+        self.partials = 0
+        self.late = 0
+
+    def _add(self, txid, keys, signatures, decode):
+        self.partials += 1
+        if txid in self.completed:
+            self.late += 1
+            return None
+        entry = self.pending.get(txid)
+        if entry is None:
+            entry = self.pending[txid] = _Pending(decode())
+        else:
+            entry.merge(keys, signatures)
+        if not entry.complete:
+            return None
+        del self.pending[txid]
+        self.completed.add(txid)
+        return entry.mtx
+
+    def add(self, mtx, txid=None):
+        """Merge a partial MultisigTransaction; returns the fully signed
+        transaction if this partial completed it, otherwise None. The
+        partial itself is not modified."""
+        msig = mtx.multisig
+        return self._add(
+            txid or mtx.transaction.get_txid(),
+            (msig.version, msig.threshold,
+             tuple(s.public_key for s in msig.subsigs)),
+            [s.signature for s in msig.subsigs],
+            lambda: transaction.MultisigTransaction(mtx.transaction,
+                                                    copy.deepcopy(msig)))
+
+    def add_encoded(self, encoded):
+        """add() for a base64 msgpack-encoded partial."""
+        fields = msgpack.unpackb(base64.b64decode(encoded), raw=False)
+        msig = fields["msig"]
+        return self._add(
+            txid(fields["txn"]),
+            (msig.get("v", 0), msig.get("thr", 0),
+             tuple(s["pk"] for s in msig["subsig"])),
+            [s.get("s") for s in msig["subsig"]],
+            lambda: encoding.msgpack_decode(encoded))
+
+    def partial(self, txid):
+        """The signatures merged so far for a transaction that has not
+        reached its threshold."""
+        return self.pending[txid].mtx
+
+    def stats(self):
+        return {"partials": self.partials, "pending": len(self.pending),
+                "completed": len(self.completed), "late": self.late}
@@ -0,0 +1,115 @@
+"""Run the behave scenarios across several worker processes.
+
+    python -m harness.parallel -n 4 [behave options]
+
+Run from the directory the feature files were copied to (py_behave). Every
+scenario, including each row of a scenario outline, is assigned round-robin
+to one of the workers, and each worker is a separate behave process.
+Workers are told their index through BEHAVE_WORKER (and the run they belong
+to through BEHAVE_RUN_ID), which makes before_all provision a kmd wallet of
+their own with freshly funded accounts, so scenarios in different workers
+never share a wallet, an account or a wallet name.
+"""
+import argparse
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from behave.parser import parse_file
+
+from algosdk import transaction
+from algosdk import wallet
+
+from harness import DEFAULT_WALLET
+from harness import clients
+from harness.keyring import KeyRing
+
+
+def provision(worker, waiter, run_id="", keys=2, amount=100000000):
+    """Create a wallet for this worker and fund `keys` accounts in it with
+    `amount` microalgos each from the default wallet.
+
+    Returns the name of the new wallet.
+    """
+    kcl = clients.kmd_client()
+    acl = clients.algod_client()
+    name = "worker-{}-{}".format(run_id, worker) if run_id else \
+        "worker-{}".format(worker)
+    funder = wallet.Wallet(DEFAULT_WALLET, "", kcl)
+    sender = funder.list_keys()[0]
+    own = wallet.Wallet(name, "", kcl)
+    accounts = own.list_keys()
+    if len(accounts) < keys:
+        accounts += KeyRing(own, accounts).generate_keys(keys - len(accounts))
+    params = acl.suggested_params()
+    txids = []
+    for account in accounts[:keys]:
+        txn = transaction.PaymentTxn(
+            sender, params["fee"], params["lastRound"],
+            params["lastRound"] + 1000, params["genesishashb64"], account,
+            amount, gen=params["genesisID"])
+        txids.append(waiter.track(
+            acl.send_transaction(funder.sign_transaction(txn))))
+    for txid in txids:
+        waiter.confirm(acl, txid)
+    return name
+
+
+def scenario_locations(paths, feature_dir="."):
+    """file:line of every scenario (and outline row) in the feature files."""
+    if not paths:
+        paths = sorted(glob.glob(os.path.join(feature_dir, "*.feature")))
+    locations = []
+    for path in paths:
+        feature = parse_file(path)
+        if feature is None:
+            continue
+        for scenario in feature.walk_scenarios():
+            locations.append("{}:{}".format(path, scenario.location.line))
+    return locations
+
+
+def shard(items, n):
+    return [items[i::n] for i in range(n)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("-n", "--workers", type=int,
+                        default=os.cpu_count() or 2)
+    parser.add_argument("--features", nargs="*", default=[],
+                        help="feature files to shard (default: *.feature)")
+    args, behave_args = parser.parse_known_args(argv)
+    locations = scenario_locations(args.features)
+    shards = [s for s in shard(locations, args.workers) if s]
+    run_id = str(os.getpid())
+    procs = []
+    start = time.monotonic()
+    for worker, locs in enumerate(shards):
+        env = dict(os.environ, BEHAVE_WORKER=str(worker),
+                   BEHAVE_RUN_ID=run_id)
+        log = tempfile.TemporaryFile(mode="w+")
+        procs.append((worker, log, subprocess.Popen(
+            ["behave"] + behave_args + locs, env=env, stdout=log,
+            stderr=subprocess.STDOUT)))
+    failed = 0
+    for worker, log, proc in procs:
+        code = proc.wait()
+        log.seek(0)
+        sys.stdout.write("==== worker {} (exit {}) ====\n".format(worker,
+                                                                 code))
+        sys.stdout.write(log.read())
+        log.close()
+        failed += code != 0
+    sys.stdout.write("{} scenarios on {} workers in {:.1f}s, {} workers "
+                     "failed\n"
+                     .format(len(locations), len(shards),
+                             time.monotonic() - start, failed))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
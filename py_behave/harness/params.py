@@ -0,0 +1,41 @@
+"""Round-keyed cache of the node's suggested transaction parameters."""
+import os
+import time
+
+
+class ParamsCache:
+    """Serves suggested_params() without a REST call on every step.
+
+    The cached response is keyed on its lastRound. It is dropped as soon
+    as a later round is observed (for example when the waiter sees a
+    transaction confirmed in a newer block) or after `ttl` seconds, which
+    bounds how stale lastRound can get when nothing is confirmed.
+    """
+
+    def __init__(self, ttl=2.0):
+        self.ttl = ttl
+        self.params = None
+        self.fetched_at = 0
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(ttl=float(os.environ.get("SUGGESTED_PARAMS_TTL", 2)))
+
+    def get(self, acl):
+        if self.params is not None and \
+                time.monotonic() - self.fetched_at < self.ttl:
+            self.hits += 1
+            return self.params
+        self.misses += 1
+        self.params = acl.suggested_params()
+        self.fetched_at = time.monotonic()
+        return self.params
+
+    def observe_round(self, rnd):
+        if self.params is not None and rnd > self.params["lastRound"]:
+            self.params = None
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
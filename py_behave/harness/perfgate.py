@@ -0,0 +1,219 @@
+"""Performance regression gate for the @perf scenarios.
+
+    python -m harness.perfgate --record [--repeat 10] [--baseline FILE]
+        [behave options]
+    python -m harness.perfgate [--repeat 10] [--baseline FILE]
+        [--tolerance 0.25] [--alpha 0.01] [--min-ms 0.1] [--report FILE]
+        [behave options]
+
+Run from the directory the feature files were copied to (py_behave). Runs
+the scenarios tagged @perf --repeat times, each time in a new behave
+process with STEP_TIMINGS set, and collects every scenario's and every
+step's durations across the runs. --record writes them to the baseline
+file (default perf_baseline.json), together with the SDK and Python
+versions they were measured with.
+
+Without --record the durations are compared with the baseline. A
+scenario regresses when its median duration is more than --tolerance
+(a fraction) and more than --min-ms milliseconds above the baseline
+median. A one-sided Mann-Whitney U test must also find it slower with a
+p-value under --alpha. The per-step diff is printed, regressed
+scenarios and steps are marked, and the exit status is 1 if any
+scenario regressed.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+
+FORMAT = 1
+TAG = "perf"
+
+
+def _sdk_version():
+    try:
+        from importlib import metadata
+        return metadata.version("py-algorand-sdk")
+    except Exception:
+        return "unknown"
+
+
+def samples(report, into=None):
+    """Add the durations in ms of a Cucumber JSON report's passed
+    scenarios to {scenario: {"total": [...], "steps": {step: [...]}}}."""
+    into = into if into is not None else {}
+    for feature in report:
+        seen = Counter()
+        for element in feature.get("elements", []):
+            steps = element.get("steps", [])
+            results = [s.get("result", {}) for s in steps]
+            if not steps or any(r.get("status") != "passed"
+                                for r in results):
+                continue
+            key = "{}: {}".format(feature["uri"], element["name"].strip())
+            seen[key] += 1
+            if seen[key] > 1:
+                key += " #{}".format(seen[key])
+            entry = into.setdefault(key, {"total": [],
+                                          "steps": defaultdict(list)})
+            total = 0.0
+            for i, (step, result) in enumerate(zip(steps, results), 1):
+                ms = result.get("duration", 0) / 1e6
+                total += ms
+                entry["steps"]["{}. {}{}".format(
+                    i, step["keyword"], step["name"])].append(ms)
+            entry["total"].append(total)
+    return into
+
+
+def run(repeat, behave_args):
+    """Durations of the @perf scenarios over `repeat` behave runs."""
+    result = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "steps.json")
+        for i in range(repeat):
+            env = dict(os.environ, STEP_TIMINGS=path)
+            proc = subprocess.run(
+                ["behave", "--tags=" + TAG] + behave_args, env=env,
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+            if proc.returncode:
+                sys.stdout.write(proc.stdout.decode(errors="replace"))
+                raise SystemExit("run {} of the @{} scenarios failed".format(
+                    i + 1, TAG))
+            with open(path) as f:
+                samples(json.load(f), result)
+    return result
+
+
+def mann_whitney(baseline, current):
+    """One-sided p-value of current tending to be larger than baseline
+    (Mann-Whitney U, normal approximation with continuity correction)."""
+    n1, n2 = len(baseline), len(current)
+    u = sum(1.0 if c > b else 0.5 if c == b else 0.0
+            for c in current for b in baseline)
+    sd = math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12.0)
+    if not sd:
+        return 1.0
+    z = (u - n1 * n2 / 2.0 - 0.5) / sd
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def regressed(baseline, current, tolerance, alpha, min_ms):
+    """(baseline median, current median, p-value, whether it regressed)."""
+    before = statistics.median(baseline)
+    after = statistics.median(current)
+    p = mann_whitney(baseline, current)
+    slower = after > before * (1 + tolerance) and after - before > min_ms
+    return before, after, p, slower and p < alpha
+
+
+def compare(baseline, current, tolerance=0.25, alpha=0.01, min_ms=0.1):
+    """One row per scenario with the per-step comparison in it."""
+    rows = []
+    for key, entry in current.items():
+        old = baseline.get(key)
+        if old is None:
+            rows.append({"scenario": key, "status": "new"})
+            continue
+        before, after, p, bad = regressed(old["total"], entry["total"],
+                                          tolerance, alpha, min_ms)
+        steps = []
+        for step, times in entry["steps"].items():
+            if step not in old["steps"]:
+                steps.append({"step": step, "status": "new"})
+                continue
+            s_before, s_after, s_p, s_bad = regressed(
+                old["steps"][step], times, tolerance, alpha, min_ms)
+            steps.append({"step": step, "baseline_ms": s_before,
+                          "current_ms": s_after, "p": s_p,
+                          "status": "regressed" if s_bad else "ok"})
+        rows.append({"scenario": key, "baseline_ms": before,
+                     "current_ms": after, "p": p,
+                     "status": "regressed" if bad else "ok",
+                     "steps": steps})
+    for key in baseline:
+        if key not in current:
+            rows.append({"scenario": key, "status": "missing"})
+    return rows
+
+
+def _line(row, name, indent):
+    if len(name) > 100:
+        name = name[:97] + "..."
+    if "baseline_ms" not in row:
+        return "{}{:>10} {}\n".format(indent, row["status"], name)
+    return "{}{:>10} {:>10.3f} {:>10.3f} {:>7.2f}x  p={:.4f}  {}\n".format(
+        indent, row["status"], row["baseline_ms"], row["current_ms"],
+        row["current_ms"] / row["baseline_ms"] if row["baseline_ms"]
+        else float("inf"), row["p"], name)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--baseline", default="perf_baseline.json")
+    parser.add_argument("--record", action="store_true",
+                        help="write the baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--alpha", type=float, default=0.01)
+    parser.add_argument("--min-ms", type=float, default=0.1)
+    parser.add_argument("--report", help="write the comparison as JSON")
+    args, behave_args = parser.parse_known_args(argv)
+
+    baseline = None
+    if not args.record:
+        try:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            raise SystemExit("no baseline at {}; run with --record first"
+                             .format(args.baseline))
+        if baseline.get("format") != FORMAT:
+            raise SystemExit("{} is baseline format {}, expected {}".format(
+                args.baseline, baseline.get("format"), FORMAT))
+
+    current = run(args.repeat, behave_args)
+    if not current:
+        raise SystemExit("no @{} scenario passed".format(TAG))
+    if args.record:
+        with open(args.baseline, "w") as f:
+            json.dump({"format": FORMAT, "sdk": _sdk_version(),
+                       "python": platform.python_version(),
+                       "recorded": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                       "repeat": args.repeat, "scenarios": current},
+                      f, indent=1)
+        sys.stdout.write("recorded {} scenarios x {} runs in {}\n".format(
+            len(current), args.repeat, args.baseline))
+        return 0
+
+    rows = compare(baseline["scenarios"], current, args.tolerance,
+                   args.alpha, args.min_ms)
+    out = sys.stdout
+    out.write("baseline: sdk {}, python {}, recorded {}\n".format(
+        baseline.get("sdk"), baseline.get("python"),
+        baseline.get("recorded")))
+    out.write("current:  sdk {}, python {}\n".format(
+        _sdk_version(), platform.python_version()))
+    out.write("{:>10} {:>10} {:>10} {:>8}\n".format(
+        "status", "base ms", "now ms", "ratio"))
+    for row in rows:
+        out.write(_line(row, row["scenario"], ""))
+        for step in row.get("steps", []):
+            out.write(_line(step, step["step"], "    "))
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(rows, f, indent=2)
+    bad = [r for r in rows if r["status"] == "regressed"]
+    out.write("{} of {} scenarios regressed\n".format(len(bad), len(rows)))
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""Keep-alive HTTP transport for the SDK clients.
+
+The algod and kmd clients send every request with urllib's urlopen, whose
+default HTTP handler opens a new connection per request and asks the
+server to close it afterwards. install() replaces the process-wide urllib
+opener with one whose HTTP handler keeps connections open and reuses them,
+so every client in the process, in every scenario, shares one pool.
+"""
+import http.client
+import io
+import socket
+import threading
+import urllib.request
+import urllib.response
+
+# errors meaning a reused keep-alive connection was closed by the server
+_STALE = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+          BrokenPipeError, ConnectionResetError)
+# methods safe to resend on a fresh connection when a reused one was stale;
+# a POST may already have been acted on, so its error is raised instead
+_RETRY = ("GET", "HEAD")
+
+
+class _Connection(http.client.HTTPConnection):
+    def connect(self):
+        super().connect()
+        # requests are small and a kept connection carries one after
+        # another, so don't let Nagle hold them back for the last ACK
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+class ConnectionPool:
+    """Idle connections per host, at most `size` of them kept per host."""
+
+    def __init__(self, size=8):
+        self.size = size
+        self.idle = {}
+        self.lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+        self.requests = 0
+        self.discarded = 0
+
+    def get(self, host, timeout):
+        with self.lock:
+            self.requests += 1
+            idle = self.idle.get(host)
+            if idle:
+                self.reused += 1
+                return idle.pop(), True
+            self.opened += 1
+        return _Connection(host, timeout=timeout), False
+
+    def put(self, host, conn):
+        with self.lock:
+            idle = self.idle.setdefault(host, [])
+            if len(idle) < self.size:
+                idle.append(conn)
+                return
+            self.discarded += 1
+        conn.close()
+
+    def close(self):
+        with self.lock:
+            for idle in self.idle.values():
+                for conn in idle:
+                    conn.close()
+            self.idle = {}
+
+    def stats(self):
+        return {"size": self.size, "requests": self.requests,
+                "opened": self.opened, "reused": self.reused,
+                "discarded": self.discarded}
+
+
+class KeepAliveHandler(urllib.request.HTTPHandler):
+    def __init__(self, pool):
+        super().__init__()
+        self.pool = pool
+
+    def http_open(self, req):
+        headers = dict(req.unredirected_hdrs)
+        headers.update((k, v) for k, v in req.headers.items()
+                       if k not in headers)
+        headers["Connection"] = "keep-alive"
+        headers = {k.title(): v for k, v in headers.items()}
+        host = req.host
+        method = req.get_method()
+        while True:
+            conn, reused = self.pool.get(host, req.timeout)
+            try:
+                conn.request(method, req.selector, req.data, headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except _STALE:
+                conn.close()
+                if reused and method in _RETRY:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            break
+        if resp.will_close:
+            conn.close()
+        else:
+            self.pool.put(host, conn)
+        result = urllib.response.addinfourl(io.BytesIO(body), resp.msg,
+                                            req.get_full_url(), resp.status)
+        result.msg = resp.reason
+        return result
+
+
+def install(size=8):
+    """Route urlopen through a keep-alive pool; returns the pool."""
+    pool = ConnectionPool(size)
+    urllib.request.install_opener(
+        urllib.request.build_opener(KeepAliveHandler(pool)))
+    return pool
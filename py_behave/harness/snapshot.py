@@ -0,0 +1,92 @@
+"""The ledger fixture stored in network snapshots.
+
+    python -m harness.snapshot FIXTURE [--accounts 4] [--amount 100000000]
+
+Run from py_behave against a freshly created network (NODE_DIR, KMD_DIR),
+this generates --accounts keys in a wallet of their own, funds each with
+--amount microalgos from the default wallet, creates an asset held by
+the first of them, opts the others in and sends each of them some of it,
+then writes what it created to FIXTURE as JSON. scripts/setup.sh does
+this once when LEDGER_SNAPSHOT is set and archives the network directory
+together with FIXTURE, and scripts/test.sh restores that archive instead
+of creating a new network. Only the "Restored ledger" scenario reads the
+fixture, to check it; the other scenarios set up their own accounts and
+assets as before.
+"""
+import argparse
+import json
+
+from algosdk import transaction
+from algosdk import wallet
+
+from harness import clients
+from harness import DEFAULT_WALLET
+from harness.keyring import KeyRing
+from harness.loadgen import setup_asset
+from harness.waiter import ConfirmationWaiter
+
+VERSION = 1
+WALLET = "ledger-fixture"
+ASSET_NAME = "fixture"
+ASSET_AMOUNT = 1000000
+
+
+def create(accounts=4, amount=100000000):
+    kcl = clients.kmd_client()
+    acl = clients.algod_client()
+    waiter = ConfirmationWaiter.from_env()
+    w = wallet.Wallet(DEFAULT_WALLET, "", kcl)
+    funder = w.list_keys()[0]
+    ring = KeyRing(wallet.Wallet(WALLET, "", kcl))
+    addresses = ring.generate_keys(accounts)
+    keys = list(zip(addresses, ring.export_keys(addresses)))
+    params = acl.suggested_params()
+    first = params["lastRound"]
+
+    def send(signed):
+        txids = [acl.send_transaction(stx) for stx in signed]
+        for txid in txids:
+            waiter.confirm(acl, txid)
+
+    send([w.sign_transaction(transaction.PaymentTxn(
+        funder, params["fee"], first, first + 1000, params["genesishashb64"],
+        address, amount, gen=params["genesisID"])) for address in addresses])
+    index = setup_asset(acl, keys, waiter, ASSET_NAME, ASSET_AMOUNT)
+    creator = keys[0][0]
+    return {
+        "version": VERSION,
+        "genesis_id": params["genesisID"],
+        "genesis_hash": params["genesishashb64"],
+        "wallet": WALLET,
+        "accounts": addresses,
+        "asset": {"index": index, "creator": creator, "name": ASSET_NAME,
+                  "holding": ASSET_AMOUNT},
+        "round": acl.status()["lastRound"],
+    }
+
+
+def attach(acl, path):
+    """The fixture in `path`, after checking it belongs to the network acl
+    is connected to."""
+    with open(path) as f:
+        fixture = json.load(f)
+    if fixture.get("version") != VERSION:
+        raise ValueError("{}: unsupported fixture version {}".format(
+            path, fixture.get("version")))
+    if acl.suggested_params()["genesishashb64"] != fixture["genesis_hash"]:
+        raise ValueError("{} was made on a different network".format(path))
+    return fixture
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("fixture")
+    parser.add_argument("--accounts", type=int, default=4)
+    parser.add_argument("--amount", type=int, default=100000000)
+    args = parser.parse_args(argv)
+    with open(args.fixture, "w") as f:
+        json.dump(create(args.accounts, args.amount), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Per-step timings in Cucumber JSON, and a cross-SDK comparison of them.
+
+StepTimes collects the duration of every step behave runs and writes them
+in the Cucumber JSON report format, the same format godog
+(--godog.format=cucumber), cucumber-jvm (--plugin json:FILE) and
+cucumber-js (--format json:FILE) produce, with durations in nanoseconds.
+
+    python -m harness.steptimes go=go.json java=java.json js=js.json \\
+        py=py.json [--report FILE]
+
+reads one such report per SDK and prints, for every step text, the median
+duration in each SDK and how the Python median compares with the fastest
+of the others.
+"""
+import argparse
+import json
+import statistics
+import sys
+from collections import defaultdict
+
+STATUSES = {"passed": "passed", "failed": "failed", "skipped": "skipped",
+            "undefined": "undefined", "untested": "skipped"}
+
+
+class StepTimes:
+    def __init__(self):
+        self.features = []
+
+    def feature(self, feature):
+        self.features.append({
+            "uri": feature.filename,
+            "id": feature.name.lower().replace(" ", "-"),
+            "keyword": feature.keyword,
+            "name": feature.name,
+            "line": feature.line,
+            "elements": [],
+        })
+
+    def scenario(self, scenario):
+        self.features[-1]["elements"].append({
+            "id": scenario.name.lower().replace(" ", "-"),
+            "keyword": scenario.keyword,
+            "name": scenario.name,
+            "line": scenario.line,
+            "type": "scenario",
+            "steps": [],
+        })
+
+    def step(self, step):
+        self.features[-1]["elements"][-1]["steps"].append({
+            "keyword": step.keyword + " ",
+            "name": step.name,
+            "line": step.line,
+            "result": {
+                "status": STATUSES.get(step.status.name, "failed"),
+                "duration": int(step.duration * 1e9),
+            },
+        })
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump(self.features, f, indent=1)
+
+
+def durations(report):
+    """{step text: [duration in ms, ...]} of the passed steps of a Cucumber
+    JSON report."""
+    steps = defaultdict(list)
+    for feature in report:
+        for element in feature.get("elements", []):
+            for step in element.get("steps", []):
+                result = step.get("result", {})
+                if result.get("status") == "passed" and "duration" in result:
+                    steps[step["name"].strip()].append(
+                        result["duration"] / 1e6)
+    return steps
+
+
+def compare(reports, python="py"):
+    """Median step durations per SDK, and the Python median as a multiple
+    of the fastest other SDK's."""
+    medians = defaultdict(dict)
+    for sdk, report in reports.items():
+        for name, times in durations(report).items():
+            medians[name][sdk] = statistics.median(times)
+    rows = []
+    for name, per_sdk in medians.items():
+        others = [t for sdk, t in per_sdk.items() if sdk != python]
+        row = {"step": name, "median_ms": per_sdk}
+        if python in per_sdk and others and min(others) > 0:
+            row["python_vs_fastest"] = per_sdk[python] / min(others)
+        rows.append(row)
+    rows.sort(key=lambda r: -r.get("python_vs_fastest", 0))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("reports", nargs="+", metavar="SDK=FILE")
+    parser.add_argument("--report", help="write the comparison as JSON")
+    args = parser.parse_args(argv)
+    reports = {}
+    for arg in args.reports:
+        sdk, _, path = arg.partition("=")
+        with open(path) as f:
+            reports[sdk] = json.load(f)
+    rows = compare(reports)
+    sdks = list(reports)
+    out = sys.stdout
+    out.write("{:>8} ".format("py/best") +
+              " ".join("{:>10}".format(s) for s in sdks) + "  step\n")
+    for row in rows:
+        ratio = row.get("python_vs_fastest")
+        out.write("{:>8} ".format("{:.2f}".format(ratio) if ratio else "-") +
+                  " ".join("{:>10}".format(
+                      "{:.1f}".format(row["median_ms"][s])
+                      if s in row["median_ms"] else "-") for s in sdks) +
+                  "  " + row["step"] + "\n")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""Compact storage for large batches of payment and asset transfer
+transactions.
+
+Every transaction.PaymentTxn or AssetTransferTxn keeps its fields in a
+per-instance dict of Python objects, and every SignedTransaction adds
+another object and a base64 signature string. TxnBatch keeps the same
+fields in typed arrays with one entry per transaction. Addresses and
+genesis hash/ID pairs are stored once and referred to by index, notes
+are packed into one bytearray, and signatures into another. batch[i]
+builds the SDK object for transaction i on demand, and it encodes the
+same as the object the transaction was added from.
+
+Leases and group IDs are not supported.
+"""
+import base64
+from array import array
+
+from nacl import signing
+
+from algosdk import constants
+from algosdk import encoding
+from algosdk import transaction
+
+PAY, AXFER = 0, 1
+_NONE = -1
+_SIG_LEN = 64
+# a stand-in signature, for estimate_size without signing anything
+_BLANK_SIG = base64.b64encode(bytes(_SIG_LEN)).decode()
+
+
+class TxnBatch:
+    """Payment and asset transfer transactions, optionally signed.
+
+        batch = TxnBatch()
+        batch.add_payment(sender, fee, first, last, gh, receiver, amt)
+        batch.sign_all(private_key)
+        stx = batch[0]
+    """
+
+    __slots__ = ("_type", "_sender", "_receiver", "_close", "_revocation",
+                 "_fee", "_first", "_last", "_amount", "_asset", "_genesis",
+                 "_note_end", "_notes", "_signed", "_sigs", "_addresses",
+                 "_address_index", "_genesis_table", "_genesis_index")
+
+    def __init__(self):
+        self._type = array("B")
+        self._sender = array("i")
+        self._receiver = array("i")
+        self._close = array("i")
+        self._revocation = array("i")
+        self._fee = array("Q")
+        self._first = array("Q")
+        self._last = array("Q")
+        self._amount = array("Q")
+        self._asset = array("Q")
+        self._genesis = array("H")
+        self._note_end = array("Q")
+        self._notes = bytearray()
+        self._signed = array("B")
+        self._sigs = bytearray()
+        self._addresses = []
+        self._address_index = {}
+        self._genesis_table = []
+        self._genesis_index = {}
+
+    def __len__(self):
+        return len(self._type)
+
+    def __getitem__(self, i):
+        """The SDK object for transaction i: a SignedTransaction once it is
+        signed, the PaymentTxn or AssetTransferTxn before that."""
+        if i < 0:
+            i += len(self)
+        txn = self.transaction(i)
+        if not self._signed[i]:
+            return txn
+        sig = self._sigs[i * _SIG_LEN:(i + 1) * _SIG_LEN]
+        return transaction.SignedTransaction(
+            txn, base64.b64encode(sig).decode())
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def _address(self, address):
+        if address is None:
+            return _NONE
+        index = self._address_index.get(address)
+        if index is None:
+            index = self._address_index[address] = len(self._addresses)
+            self._addresses.append(address)
+        return index
+
+    def _add(self, kind, sender, fee, first, last, gh, receiver, amt, index,
+             close, revocation, note, gen, flat_fee):
+        genesis = self._genesis_index.get((gh, gen))
+        if genesis is None:
+            genesis = len(self._genesis_table)
+            self._genesis_index[(gh, gen)] = genesis
+            self._genesis_table.append((gh, gen))
+        self._type.append(kind)
+        self._sender.append(self._address(sender))
+        self._receiver.append(self._address(receiver))
+        self._close.append(self._address(close))
+        self._revocation.append(self._address(revocation))
+        self._fee.append(fee)
+        self._first.append(first)
+        self._last.append(last)
+        self._amount.append(amt)
+        self._asset.append(index or 0)
+        self._genesis.append(genesis)
+        self._notes += note or b""
+        self._note_end.append(len(self._notes))
+        self._signed.append(0)
+        self._sigs += bytes(_SIG_LEN)
+        i = len(self) - 1
+        # the same fee the SDK constructors compute, see _estimate_size
+        if flat_fee:
+            self._fee[i] = max(constants.min_txn_fee, fee)
+        else:
+            self._fee[i] = max(self._estimate_size(i) * fee,
+                               constants.min_txn_fee)
+        return i
+
+    def add_payment(self, sender, fee, first, last, gh, receiver, amt,
+                    close_remainder_to=None, note=None, gen=None,
+                    flat_fee=False):
+        """Add the transaction.PaymentTxn these arguments would build;
+        returns its index."""
+        return self._add(PAY, sender, fee, first, last, gh, receiver, amt,
+                         None, close_remainder_to, None, note, gen, flat_fee)
+
+    def add_transfer(self, sender, fee, first, last, gh, receiver, amt, index,
+                     close_assets_to=None, revocation_target=None, note=None,
+                     gen=None, flat_fee=False):
+        """Add the transaction.AssetTransferTxn these arguments would build;
+        returns its index."""
+        return self._add(AXFER, sender, fee, first, last, gh, receiver, amt,
+                         index, close_assets_to, revocation_target, note, gen,
+                         flat_fee)
+
+    def append(self, txn):
+        """Add a PaymentTxn, AssetTransferTxn or a SignedTransaction of one;
+        returns its index."""
+        sig = None
+        if isinstance(txn, transaction.SignedTransaction):
+            sig = txn.signature
+            txn = txn.transaction
+        if txn.lease or txn.group:
+            raise ValueError("leases and groups are not supported")
+        if isinstance(txn, transaction.PaymentTxn):
+            i = self.add_payment(
+                txn.sender, txn.fee, txn.first_valid_round,
+                txn.last_valid_round, txn.genesis_hash, txn.receiver,
+                txn.amt, txn.close_remainder_to, txn.note, txn.genesis_id,
+                flat_fee=True)
+        elif isinstance(txn, transaction.AssetTransferTxn):
+            i = self.add_transfer(
+                txn.sender, txn.fee, txn.first_valid_round,
+                txn.last_valid_round, txn.genesis_hash, txn.receiver,
+                txn.amount, txn.index, txn.close_assets_to,
+                txn.revocation_target, txn.note, txn.genesis_id,
+                flat_fee=True)
+        else:
+            raise ValueError("not a payment or asset transfer: {}".format(
+                type(txn).__name__))
+        if sig:
+            self._set_sig(i, base64.b64decode(sig))
+        return i
+
+    def extend(self, txns):
+        for txn in txns:
+            self.append(txn)
+
+    def transaction(self, i):
+        """The unsigned SDK transaction i."""
+        start = self._note_end[i - 1] if i else 0
+        note = bytes(self._notes[start:self._note_end[i]]) or None
+        gh, gen = self._genesis_table[self._genesis[i]]
+        sender = self._addresses[self._sender[i]]
+        receiver = self._lookup(self._receiver[i])
+        if self._type[i] == PAY:
+            return transaction.PaymentTxn(
+                sender, self._fee[i], self._first[i], self._last[i], gh,
+                receiver, self._amount[i], self._lookup(self._close[i]),
+                note, gen, flat_fee=True)
+        return transaction.AssetTransferTxn(
+            sender, self._fee[i], self._first[i], self._last[i], gh,
+            receiver, self._amount[i], self._asset[i] or None,
+            self._lookup(self._close[i]), self._lookup(self._revocation[i]),
+            note, gen, flat_fee=True)
+
+    def _lookup(self, index):
+        return None if index == _NONE else self._addresses[index]
+
+    def _estimate_size(self, i):
+        # Transaction.estimate_size signs with a freshly generated key to
+        # measure the signed encoding; every signature is 64 bytes, so a
+        # blank one gives the same length
+        txn = self.transaction(i)
+        txn.fee = self._fee[i]
+        stx = transaction.SignedTransaction(txn, _BLANK_SIG)
+        return len(base64.b64decode(encoding.msgpack_encode(stx)))
+
+    def _set_sig(self, i, sig):
+        self._sigs[i * _SIG_LEN:(i + 1) * _SIG_LEN] = sig
+        self._signed[i] = 1
+
+    def sign(self, i, private_key, signing_key=None):
+        """Sign transaction i with private_key, as Transaction.sign does."""
+        if signing_key is None:
+            signing_key = signing.SigningKey(
+                base64.b64decode(private_key)[:constants.key_len_bytes])
+        data = base64.b64decode(encoding.msgpack_encode(self.transaction(i)))
+        self._set_sig(i, signing_key.sign(constants.txid_prefix + data)
+                      .signature)
+
+    def sign_all(self, private_key):
+        """Sign every transaction sent from private_key's address."""
+        key = signing.SigningKey(
+            base64.b64decode(private_key)[:constants.key_len_bytes])
+        sender = self._address_index.get(encoding.encode_address(
+            bytes(key.verify_key)))
+        for i, s in enumerate(self._sender):
+            if s == sender:
+                self.sign(i, private_key, key)
+
+    def encode(self, i):
+        """The msgpack encoding of batch[i], as bytes."""
+        return base64.b64decode(encoding.msgpack_encode(self[i]))
@@ -0,0 +1,96 @@
+"""Streaming access to transaction files.
+
+The files are the ones transaction.write_to_file produces: msgpack-encoded
+transactions, signed transactions or multisig transactions written back to
+back. Unlike transaction.retrieve_from_file, which returns a list of the
+whole file, these read and write one object at a time, so memory use does
+not depend on the size of the file.
+"""
+import itertools
+from contextlib import closing
+
+import msgpack
+
+from algosdk import encoding
+from algosdk import transaction
+
+READ_SIZE = 1 << 16
+
+
+def _undictify(d):
+    # same dispatch as transaction.retrieve_from_file
+    if "msig" in d:
+        return transaction.MultisigTransaction.undictify(d)
+    if "sig" in d:
+        return transaction.SignedTransaction.undictify(d)
+    if "type" in d:
+        return transaction.Transaction.undictify(d)
+    if "txn" in d:
+        return transaction.Transaction.undictify(d["txn"])
+    raise ValueError("not a transaction: keys {}".format(sorted(d)))
+
+
+def iter_file(path, read_size=READ_SIZE):
+    """Lazily yield the transactions in the file at path."""
+    with open(path, "rb") as f:
+        for d in msgpack.Unpacker(f, raw=False, read_size=read_size):
+            yield _undictify(d)
+
+
+def read_first(path):
+    """The first transaction in the file at path."""
+    with closing(iter_file(path)) as txns:
+        for txn in txns:
+            return txn
+    raise ValueError("{}: no transactions in file".format(path))
+
+
+class TxnFileWriter:
+    """Appends transactions to a file one at a time.
+
+        with TxnFileWriter(path) as w:
+            for stx in signed:
+                w.write(stx)
+    """
+
+    def __init__(self, path, overwrite=True):
+        self.file = open(path, "wb" if overwrite else "ab")
+        self.count = 0
+        self.size = 0
+
+    def write(self, txn):
+        # wrapped and packed the way transaction.write_to_file does it
+        if isinstance(txn, transaction.Transaction):
+            data = msgpack.packb({"txn": txn.dictify()}, use_bin_type=True)
+        else:
+            data = msgpack.packb(txn.dictify(), use_bin_type=True)
+        self.file.write(data)
+        self.count += 1
+        self.size += len(data)
+
+    def write_all(self, txns):
+        for txn in txns:
+            self.write(txn)
+        return self.count
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def first_difference(path_a, path_b):
+    """Index of the first transaction that encodes differently in the two
+    files (including one file being shorter), or None if they match."""
+    with closing(iter_file(path_a)) as txns_a, \
+            closing(iter_file(path_b)) as txns_b:
+        pairs = itertools.zip_longest(txns_a, txns_b)
+        for i, (a, b) in enumerate(pairs):
+            if a is None or b is None or \
+                    encoding.msgpack_encode(a) != encoding.msgpack_encode(b):
+                return i
+    return None
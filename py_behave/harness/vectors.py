@@ -0,0 +1,50 @@
+"""Golden vectors from the Examples tables of the shared feature files."""
+import base64
+import os
+
+from behave.parser import parse_file
+
+from algosdk import account
+from algosdk import mnemonic
+from algosdk import transaction
+
+FEATURES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__)))), "features")
+
+
+def examples(scenario, feature="offline.feature"):
+    """Rows of the named scenario outline's Examples, as dicts."""
+    parsed = parse_file(os.path.join(FEATURES_DIR, feature))
+    for outline in parsed.scenarios:
+        if outline.name == scenario:
+            return [dict(zip(ex.table.headings, row.cells))
+                    for ex in outline.examples for row in ex.table]
+    raise KeyError("no scenario outline {!r} in {}".format(scenario,
+                                                          feature))
+
+
+def _none(value):
+    return None if value == "none" else value
+
+
+def payment(row, offset=0, sender=None, flat_fee=False):
+    """The PaymentTxn the payment transaction parameters step would build
+    from `row`, with first and last valid shifted by `offset` so batches
+    get distinct transactions. The sender defaults to the row's key."""
+    if sender is None:
+        sender = account.address_from_private_key(private_key(row))
+    note = _none(row["note"])
+    return transaction.PaymentTxn(
+        sender, int(row["fee"]), int(row["fv"]) + offset,
+        int(row["lv"]) + offset, row["gh"], row["to"], int(row["amt"]),
+        _none(row["close"]), base64.b64decode(note) if note else None,
+        _none(row["gen"]), flat_fee=flat_fee)
+
+
+def private_key(row):
+    return mnemonic.to_private_key(row["mn"])
+
+
+def multisig(row):
+    return transaction.Multisig(1, 2, row["addresses"].split(" "))
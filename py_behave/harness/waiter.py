@@ -0,0 +1,99 @@
+"""Round-aware waiting for transactions to be confirmed by the node."""
+import os
+import time
+
+from harness import faststart
+
+error = faststart.module("algosdk.error")
+
+
+class ConfirmationTimeout(Exception):
+    """The transaction was not confirmed before the timeout expired."""
+
+
+class ConfirmationWaiter:
+    """Polls the node until a transaction lands instead of sleeping for a
+    fixed number of rounds.
+
+    Polling starts at `interval` seconds and is multiplied by `backoff`
+    after every miss, capped at `max_interval`. Latencies are measured from
+    the moment the transaction was handed to `track` (or from the start of
+    the wait if it was not tracked) and collected per scenario. Every
+    callable in `listeners` is called with the round a transaction was
+    confirmed in.
+    """
+
+    def __init__(self, timeout=30.0, interval=0.1, backoff=1.5,
+                 max_interval=1.0):
+        self.timeout = timeout
+        self.interval = interval
+        self.backoff = backoff
+        self.max_interval = max_interval
+        self.sent = {}
+        self.latencies = []
+        self.listeners = []
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            timeout=float(os.environ.get("TXN_WAIT_TIMEOUT", 30)),
+            interval=float(os.environ.get("TXN_WAIT_INTERVAL", 0.1)),
+            backoff=float(os.environ.get("TXN_WAIT_BACKOFF", 1.5)),
+            max_interval=float(os.environ.get("TXN_WAIT_MAX_INTERVAL", 1)))
+
+    def start_scenario(self):
+        self.sent = {}
+        self.latencies = []
+
+    def track(self, txid):
+        """Remember when txid was submitted; returns txid."""
+        self.sent[txid] = time.monotonic()
+        return txid
+
+    def until(self, fn):
+        """Call fn until it returns a truthy value without raising an
+        AlgodHTTPError, and return that value."""
+        deadline = time.monotonic() + self.timeout
+        delay = self.interval
+        while True:
+            try:
+                result = fn()
+                if result:
+                    return result
+            except error.AlgodHTTPError:
+                if time.monotonic() >= deadline:
+                    raise
+            if time.monotonic() >= deadline:
+                raise ConfirmationTimeout("condition not met after {}s"
+                                          .format(self.timeout))
+            time.sleep(delay)
+            delay = min(delay * self.backoff, self.max_interval)
+
+    def confirm(self, acl, txid):
+        """Wait for txid to be committed and return its pending info.
+
+        Raises ConfirmationTimeout if the timeout expires first, and
+        AssertionError if the node dropped the transaction from its pool.
+        """
+        start = self.sent.get(txid, time.monotonic())
+
+        def confirmed():
+            info = acl.pending_transaction_info(txid)
+            assert not info.get("poolerror"), info["poolerror"]
+            if info.get("round", 0) > 0:
+                return info
+
+        info = self.until(confirmed)
+        self.latencies.append(time.monotonic() - start)
+        for listener in self.listeners:
+            listener(info["round"])
+        return info
+
+    def summary(self):
+        if not self.latencies:
+            return None
+        return {
+            "confirmed": len(self.latencies),
+            "mean": sum(self.latencies) / len(self.latencies),
+            "max": max(self.latencies),
+        }
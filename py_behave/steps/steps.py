@@ -1,22 +1,34 @@
-from behave import given, when, then
+from behave import given, when, then, use_step_matcher
 import base64
-from algosdk import kmd
-from algosdk import transaction
-from algosdk import encoding
-from algosdk import algod
-from algosdk import account
-from algosdk import mnemonic
-from algosdk import wallet
-from algosdk import auction
-from algosdk import util
-from algosdk import constants
 import os
 from datetime import datetime
+from harness import faststart
+
+kmd = faststart.module("algosdk.kmd")
+transaction = faststart.module("algosdk.transaction")
+encoding = faststart.module("algosdk.encoding")
+algod = faststart.module("algosdk.algod")
+account = faststart.module("algosdk.account")
+mnemonic = faststart.module("algosdk.mnemonic")
+wallet = faststart.module("algosdk.wallet")
+auction = faststart.module("algosdk.auction")
+util = faststart.module("algosdk.util")
+constants = faststart.module("algosdk.constants")
+aio = faststart.module("harness.aio")
+assets = faststart.module("harness.assets")
+blocks = faststart.module("harness.blocks")
+clients = faststart.module("harness.clients")
+history = faststart.module("harness.history")
+snapshot = faststart.module("harness.snapshot")
+txnfile = faststart.module("harness.txnfile")
+
+if faststart.ENABLED:
+    use_step_matcher(faststart.MATCHER)
 
 
 @when("I create a wallet")
 def create_wallet(context):
-    context.wallet_name = "Walletpy"
+    context.wallet_name = "Walletpy" + context.wallet_suffix
     context.wallet_pswd = ""
     context.wallet_id = context.kcl.create_wallet(context.wallet_name, context.wallet_pswd)["id"]
 
@@ -41,7 +53,7 @@ def get_mdk(context):
 
 @when("I rename the wallet")
 def rename_wallet(context):
-    context.wallet_name = "Walletpy_new"
+    context.wallet_name = "Walletpy_new" + context.wallet_suffix
     context.kcl.rename_wallet(context.wallet_id, context.wallet_pswd, context.wallet_name)
 
 
@@ -169,11 +181,48 @@ def status_block(context):
     context.status_after = context.acl.status_after_block(context.status["lastRound"])
 
 
+@given("the restored ledger")
+def restored_ledger(context):
+    path = os.environ.get("LEDGER_FIXTURE")
+    if not path:
+        context.scenario.skip("no ledger snapshot restored (LEDGER_SNAPSHOT)")
+        return
+    context.fixture = snapshot.attach(context.acl, path)
+    context.asset_index = context.fixture["asset"]["index"]
+
+
+@then("the restored accounts and asset should exist")
+def check_restored(context):
+    asset = context.fixture["asset"]
+    assert context.acl.asset_info(asset["index"])["creator"] == asset["creator"]
+    for address in context.fixture["accounts"]:
+        info = context.acl.account_info(address)
+        assert info["amount"] > 0
+        assert info["assets"][str(asset["index"])]["amount"] > 0
+
+
 @then("I can get the block info")
 def block(context):
     context.block = context.acl.block_info(context.status["lastRound"]+1)
 
 
+@then("I can get the blocks of the last {count} rounds")
+def block_range(context, count):
+    last = context.status["lastRound"]
+    first = max(1, last - int(count) + 1)
+    fetcher = blocks.BlockFetcher(context.acl, context.block_cache,
+                                  int(os.environ.get("BLOCK_PREFETCH", 8)))
+    try:
+        for rnd, block in enumerate(fetcher.blocks(first, last), first):
+            assert block["round"] == rnd
+        misses = context.block_cache.stats()["misses"]
+        for rnd, block in enumerate(fetcher.blocks(first, last), first):
+            assert block["round"] == rnd
+        assert context.block_cache.stats()["misses"] == misses
+    finally:
+        fetcher.close()
+
+
 @when("I import the multisig")
 def import_msig(context):
     context.wallet.import_multisig(context.msig)
@@ -248,27 +297,17 @@ def sk_eq_export(context):
 
 @given("a kmd client")
 def kmd_client(context):
-    data_dir_path = os.environ["NODE_DIR"] + "/"
-    kmd_folder_name = os.environ["KMD_DIR"] + "/"
-    kmd_token = open(data_dir_path + kmd_folder_name + "kmd.token",
-                     "r").read().strip("\n")
-    kmd_address = "http://" + open(data_dir_path + kmd_folder_name + "kmd.net",
-                                   "r").read().strip("\n")
-    context.kcl = kmd.KMDClient(kmd_token, kmd_address)
+    context.kcl = clients.kmd_client(context.calls)
 
 
 @given("an algod client")
 def algod_client(context):
-    data_dir_path = os.environ["NODE_DIR"] + "/"
-    algod_token = open(data_dir_path + "algod.token", "r").read().strip("\n")
-    algod_address = "http://" + open(data_dir_path + "algod.net",
-                                     "r").read().strip("\n")
-    context.acl = algod.AlgodClient(algod_token, algod_address)
+    context.acl = clients.algod_client(context.calls)
 
 
 @given("wallet information")
 def wallet_info(context):
-    context.wallet_name = "unencrypted-default-wallet"
+    context.wallet_name = context.worker_wallet
     context.wallet_pswd = ""
     context.wallet = wallet.Wallet(context.wallet_name, context.wallet_pswd, context.kcl)
     context.wallet_id = context.wallet.id
@@ -277,7 +316,7 @@ def wallet_info(context):
 
 @given('default transaction with parameters {amt} "{note}"')
 def default_txn(context, amt, note):
-    params = context.acl.suggested_params()
+    params = context.params_cache.get(context.acl)
     context.last_round = params["lastRound"]
     if note == "none":
         note = None
@@ -289,7 +328,7 @@ def default_txn(context, amt, note):
 
 @given('default multisig transaction with parameters {amt} "{note}"')
 def default_msig_txn(context, amt, note):
-    params = context.acl.suggested_params()
+    params = context.params_cache.get(context.acl)
     context.last_round = params["lastRound"]
     if note == "none":
         note = None
@@ -309,14 +348,14 @@ def get_sk(context):
 @when("I send the transaction")
 def send_txn(context):
     try:
-        context.acl.send_transaction(context.stx)
+        context.waiter.track(context.acl.send_transaction(context.stx))
     except:
         context.error = True
 
 
 @when("I send the kmd-signed transaction")
 def send_txn_kmd(context):
-    context.acl.send_transaction(context.stx_kmd)
+    context.waiter.track(context.acl.send_transaction(context.stx_kmd))
 
 
 @when("I send the bogus kmd-signed transaction")
@@ -330,24 +369,25 @@ def send_txn_kmd(context):
 @when("I send the multisig transaction")
 def send_msig_txn(context):
     try:
-        context.acl.send_transaction(context.mtx)
+        context.waiter.track(context.acl.send_transaction(context.mtx))
     except:
         context.error = True
 
 
 @then("the transaction should go through")
 def check_txn(context):
-    last_round = context.acl.status()["lastRound"]
-    assert "type" in context.acl.pending_transaction_info(context.txn.get_txid())
-    context.acl.status_after_block(last_round+2)
-    assert "type" in context.acl.transaction_info(context.txn.sender, context.txn.get_txid())
-    assert "type" in context.acl.transaction_by_id(context.txn.get_txid())
+    txid = context.txn.get_txid()
+    context.txn_info = context.waiter.confirm(context.acl, txid)
+    assert "type" in context.txn_info
+    assert "type" in context.acl.transaction_info(context.txn.sender, txid)
+    assert "type" in context.waiter.until(lambda: context.acl.transaction_by_id(txid))
 
 
 @then("I can get the transaction by ID")
 def get_txn_by_id(context):
-    context.acl.status_after_block(context.last_round+2)
-    assert "type" in context.acl.transaction_by_id(context.txn.get_txid())
+    txid = context.txn.get_txid()
+    context.waiter.confirm(context.acl, txid)
+    assert "type" in context.waiter.until(lambda: context.acl.transaction_by_id(txid))
 
 
 @then("the transaction should not go through")
@@ -380,34 +420,33 @@ def read_txn(context, txn, num):
     dir_path = os.path.dirname(os.path.realpath(__file__))
     dir_path = os.path.dirname(os.path.dirname(dir_path))
     context.num = num
-    context.txn = transaction.retrieve_from_file(dir_path + "/temp/raw" + num + ".tx")[0]
+    context.txn = txnfile.read_first(dir_path + "/temp/raw" + num + ".tx")
     
 
 @when("I write the transaction to file")
 def write_txn(context):
     dir_path = os.path.dirname(os.path.realpath(__file__))
     dir_path = os.path.dirname(os.path.dirname(dir_path))
-    transaction.write_to_file([context.txn], dir_path + "/temp/raw" + context.num + ".tx")
+    with txnfile.TxnFileWriter(dir_path + "/temp/raw" + context.num + ".tx") as w:
+        w.write(context.txn)
 
 
 @then("the transaction should still be the same")
 def check_enc(context):
     dir_path = os.path.dirname(os.path.realpath(__file__))
     dir_path = os.path.dirname(os.path.dirname(dir_path))
-    new = transaction.retrieve_from_file(dir_path + "/temp/raw" + context.num + ".tx")
-    old = transaction.retrieve_from_file(dir_path + "/temp/old" + context.num + ".tx")
-    assert encoding.msgpack_encode(new[0]) == encoding.msgpack_encode(old[0])
+    new = dir_path + "/temp/raw" + context.num + ".tx"
+    old = dir_path + "/temp/old" + context.num + ".tx"
+    assert txnfile.first_difference(new, old) is None
 
 
 @then("I do my part")
 def check_save_txn(context):
     dir_path = os.path.dirname(os.path.realpath(__file__))
     dir_path = os.path.dirname(os.path.dirname(dir_path))
-    stx = transaction.retrieve_from_file(dir_path + "/temp/txn.tx")[0]
+    stx = txnfile.read_first(dir_path + "/temp/txn.tx")
     txid = stx.transaction.get_txid()
-    last_round = context.acl.status()["lastRound"]
-    context.acl.status_after_block(last_round + 2)
-    assert context.acl.transaction_info(stx.transaction.sender, txid)
+    assert context.waiter.until(lambda: context.acl.transaction_info(stx.transaction.sender, txid))
 
 
 @then("I get the ledger supply")
@@ -457,6 +496,27 @@ def sign_bid(context):
     context.old = context.bid.sign(context.sk)
 
 
+@when("I create and sign {count} bids")
+def create_sign_bids(context, count):
+    context.sk, pk = account.generate_account()
+    context.old_bids = [auction.Bid(pk, 1, 2, i, pk, 4).sign(context.sk)
+                        for i in range(1, int(count) + 1)]
+    context.encoded_bids = [encoding.msgpack_encode(b)
+                            for b in context.old_bids]
+
+
+@when("I encode and decode the bids")
+def enc_dec_bids(context):
+    context.sbids = [encoding.msgpack_decode(b) for b in context.encoded_bids]
+
+
+@then("the bids should still be the same")
+def check_bids(context):
+    assert context.sbids == context.old_bids
+    assert [encoding.msgpack_encode(b) for b in context.sbids] == \
+        context.encoded_bids
+
+
 @when("I decode the address")
 def decode_addr(context):
     context.pk = encoding.decode_address(context.pk)
@@ -531,8 +591,8 @@ def check_microalgos(context, microalgos):
 
 @then("I get transactions by address and round")
 def txns_by_addr_round(context):
-    txns = context.acl.transactions_by_address(context.accounts[0], first=1, last=context.acl.status()["lastRound"])
-    assert (txns == {} or "transactions" in txns)
+    for txn in history.transactions(context.acl, context.accounts[0]):
+        assert "type" in txn
 
 
 @then("I get transactions by address only")
@@ -548,6 +608,18 @@ def txns_by_addr_date(context):
     assert (txns == {} or "transactions" in txns)
 
 
+@then("I get account information, the ledger supply, pending transactions and transactions by address concurrently")
+def concurrent_queries(context):
+    acl = aio.AsyncClient(context.acl)
+    info, supply, pending, txns = aio.gather(
+        acl.account_info(context.accounts[0]), acl.ledger_supply(),
+        acl.pending_transactions(), acl.transactions_by_address(context.accounts[0]))
+    assert info["address"] == context.accounts[0]
+    assert "totalMoney" in supply
+    assert (pending == {} or "truncatedTxns" in pending)
+    assert (txns == {} or "transactions" in txns)
+
+
 @then("I get pending transactions")
 def txns_pending(context):
     txns = context.acl.pending_transactions()
@@ -601,7 +673,7 @@ def step_impl(context, cnt):
 @given("default asset creation transaction with total issuance {total}")
 def default_asset_creation_txn(context, total):
     context.total = int(total)
-    params = context.acl.suggested_params()
+    params = context.params_cache.get(context.acl)
     context.last_round = params["lastRound"]
     context.pk = context.accounts[0]
     asset_name = "asset"
@@ -629,7 +701,7 @@ def default_asset_creation_txn(context, total):
 @given("default-frozen asset creation transaction with total issuance {total}")
 def default_asset_creation_txn(context, total):
     context.total = int(total)
-    params = context.acl.suggested_params()
+    params = context.params_cache.get(context.acl)
     context.last_round = params["lastRound"]
     context.pk = context.accounts[0]
     asset_name = "asset"
@@ -661,9 +733,7 @@ def asset_fixture(context):
 
 @When("I update the asset index")
 def update_asset_index(context):
-    assets = context.acl.list_assets()["assets"]
-    indices = [a["AssetIndex"] for a in assets]
-    context.asset_index = max(indices)
+    context.asset_index = assets.created(context.acl, context.txn_info)
 
 
 @When("I get the asset info")
@@ -679,8 +749,9 @@ def asset_info_match(context):
 
 @When("I create an asset destroy transaction")
 def create_asset_destroy_txn(context):
-    lastRound = context.acl.status()["lastRound"]
-    gh = context.acl.suggested_params()["genesishashb64"]
+    params = context.params_cache.get(context.acl)
+    lastRound = params["lastRound"]
+    gh = params["genesishashb64"]
     context.txn = transaction.AssetConfigTxn(context.pk, 0, lastRound, lastRound+100, gh=gh , index=context.asset_index, strict_empty_address_check=False)
 
 
@@ -696,8 +767,9 @@ def err_asset_info(context):
 
 @When("I create a no-managers asset reconfigure transaction")
 def no_manager_txn(context):
-    lastRound = context.acl.status()["lastRound"]
-    gh = context.acl.suggested_params()["genesishashb64"]
+    params = context.params_cache.get(context.acl)
+    lastRound = params["lastRound"]
+    gh = params["genesishashb64"]
     context.txn = transaction.AssetConfigTxn(context.pk, 0, lastRound, lastRound+100, gh=gh , index=context.asset_index, reserve=context.pk, clawback=context.pk, freeze=context.pk, strict_empty_address_check=False)
 
     context.expected_asset_info["managerkey"] = ""
@@ -705,7 +777,7 @@ def no_manager_txn(context):
 
 @When("I create a transaction for a second account, signalling asset acceptance")
 def accept_asset_txn(context):
-    params = context.acl.suggested_params()
+    params = context.params_cache.get(context.acl)
     last_round = params["lastRound"]
     gh = params["genesishashb64"]
     context.txn = transaction.AssetTransferTxn(context.rcv, 10, last_round, last_round+1000, gh, context.rcv, 0, context.asset_index)
@@ -713,7 +785,7 @@ def accept_asset_txn(context):
 
 @When("I create a transaction transferring {amount} assets from creator to a second account")
 def transfer_assets(context, amount):
-    params = context.acl.suggested_params()
+    params = context.params_cache.get(context.acl)
     last_round = params["lastRound"]
     gh = params["genesishashb64"]
     context.txn = transaction.AssetTransferTxn(context.pk, 10, last_round, last_round+1000, gh, context.rcv, int(amount), context.asset_index)
@@ -721,7 +793,7 @@ def transfer_assets(context, amount):
 
 @When("I create a transaction transferring {amount} assets from a second account to creator")
 def transfer_assets(context, amount):
-    params = context.acl.suggested_params()
+    params = context.params_cache.get(context.acl)
     last_round = params["lastRound"]
     gh = params["genesishashb64"]
     context.txn = transaction.AssetTransferTxn(context.rcv, 10, last_round, last_round+1000, gh, context.pk, int(amount), context.asset_index)
@@ -733,9 +805,36 @@ def check_asset_balance(context, exp_balance):
     assert asset_info["amount"] == int(exp_balance)
 
 
+@When("I add the transaction to the group")
+def add_txn_to_group(context):
+    context.group = getattr(context, "group", [])
+    context.group.append(context.txn)
+
+
+@When("I sign the group with kmd")
+def sign_group_kmd(context):
+    transaction.assign_group_id(context.group)
+    context.stx_group = [context.wallet.sign_transaction(txn) for txn in context.group]
+
+
+@When("I send the group")
+def send_group(context):
+    context.waiter.track(context.acl.send_transactions(context.stx_group))
+
+
+@Then("the group should go through")
+def check_group(context):
+    txids = [txn.get_txid() for txn in context.group]
+    context.txn_info = context.waiter.confirm(context.acl, txids[0])
+    for txn, txid in zip(context.group, txids):
+        info = context.acl.transaction_info(txn.sender, txid)
+        assert info["round"] == context.txn_info["round"]
+        assert info["group"] == base64.b64encode(txn.group).decode()
+
+
 @When("I create a freeze transaction targeting the second account")
 def freeze_txn(context):
-    params = context.acl.suggested_params()
+    params = context.params_cache.get(context.acl)
     last_round = params["lastRound"]
     gh = params["genesishashb64"]
     context.txn = transaction.AssetFreezeTxn(context.pk, 10, last_round, last_round+1000, gh, context.asset_index, context.rcv, True)
@@ -743,7 +842,7 @@ def freeze_txn(context):
 
 @When("I create an un-freeze transaction targeting the second account")
 def freeze_txn(context):
-    params = context.acl.suggested_params()
+    params = context.params_cache.get(context.acl)
     last_round = params["lastRound"]
     gh = params["genesishashb64"]
     context.txn = transaction.AssetFreezeTxn(context.pk, 10, last_round, last_round+1000, gh, context.asset_index, context.rcv, False)
@@ -751,7 +850,7 @@ def freeze_txn(context):
 
 @when("I create a transaction revoking {amount} assets from a second account to creator")
 def revoke_txn(context, amount):
-    params = context.acl.suggested_params()
+    params = context.params_cache.get(context.acl)
     last_round = params["lastRound"]
     gh = params["genesishashb64"]
     context.txn = transaction.AssetTransferTxn(context.pk, 10, last_round, last_round+1000, gh, context.pk, int(amount), context.asset_index, revocation_target=context.rcv)
@@ -85,3 +85,9 @@ mkdir ~/inst
 curl -L https://algorand-releases.s3.amazonaws.com/channel/nightly/install_nightly_linux-amd64_1.0.288.tar.gz -o ~/inst/installer.tar.gz
 tar -xf ~/inst/installer.tar.gz -C ~/inst
 ~/inst/update.sh -i -c $CHANNEL -p $BIN_DIR -d $BIN_DIR/data -n
+
+# with LEDGER_SNAPSHOT set, build the network snapshot test.sh restores
+if [ -n "$LEDGER_SNAPSHOT" ] && [ ! -f "$LEDGER_SNAPSHOT" ]
+then
+    NETWORK_DIR=~/snapshotnetwork make_snapshot
+fi
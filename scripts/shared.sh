@@ -15,3 +15,40 @@ function ensure_nodejs_version {
         fi
     fi
 }
+
+# create the private network in $NETWORK_DIR, or restore it from the
+# $LEDGER_SNAPSHOT archive if there is one (see make_snapshot)
+function create_network {
+    if [ -n "$LEDGER_SNAPSHOT" ] && [ -f "$LEDGER_SNAPSHOT" ]
+    then
+        mkdir -p $NETWORK_DIR
+        tar -xzf $LEDGER_SNAPSHOT -C $NETWORK_DIR
+        export LEDGER_FIXTURE=$NETWORK_DIR/fixture.json
+    else
+        $BIN_DIR/goal network create -n testnetwork -r $NETWORK_DIR -t network_config/$TEMPLATE
+        cp network_config/config.json $NETWORK_DIR/Node
+    fi
+}
+
+# archive a network started from genesis, with the ledger fixture
+# (funded accounts and an asset, see py_behave/harness/snapshot.py)
+# created on it, as $LEDGER_SNAPSHOT; call from the repository root
+function make_snapshot {
+    local snapshot=$LEDGER_SNAPSHOT
+    LEDGER_SNAPSHOT= create_network
+    $BIN_DIR/goal network start -r $NETWORK_DIR
+    $BIN_DIR/goal kmd start -d $NETWORK_DIR/Node
+    pushd py_behave
+    NODE_DIR=$NETWORK_DIR/Node KMD_DIR=$(basename $(ls -d $NETWORK_DIR/Node/kmd*)) \
+        python3 -m harness.snapshot $NETWORK_DIR/fixture.json
+    local status=$?
+    popd
+    $BIN_DIR/goal kmd stop -d $NETWORK_DIR/Node
+    $BIN_DIR/goal network stop -r $NETWORK_DIR
+    if [ $status -eq 0 ]
+    then
+        tar -czf $snapshot -C $NETWORK_DIR .
+    fi
+    $BIN_DIR/goal network delete -r $NETWORK_DIR
+    return $status
+}
@@ -18,11 +18,10 @@ then
     cp -r features/. js_cucumber/features
     cp -r features/. py_behave
     mkdir temp
-    $BIN_DIR/goal network create -n testnetwork -r $NETWORK_DIR -t network_config/$TEMPLATE
+    create_network
     INDEXER_DIR=$(ls -d $NETWORK_DIR/Node/testnetwork*)
     KMD_DIR=$(ls -d $NETWORK_DIR/Node/kmd*)
     export KMD_DIR=$(basename $KMD_DIR)
-    cp network_config/config.json $NODE_DIR
     $BIN_DIR/goal network start -r $NETWORK_DIR
     $BIN_DIR/goal kmd start -d $NODE_DIR
     cd go_godog/src
@@ -92,11 +91,10 @@ else
                 ;;
         esac
     done
-    $BIN_DIR/goal network create -n testnetwork -r $NETWORK_DIR -t network_config/$TEMPLATE
+    create_network
     INDEXER_DIR=$(ls -d $NETWORK_DIR/Node/testnetwork*)
     KMD_DIR=$(ls -d $NETWORK_DIR/Node/kmd*)
     export KMD_DIR=$(basename $KMD_DIR)
-    cp network_config/config.json $NODE_DIR
     $BIN_DIR/goal network start -r $NETWORK_DIR
 
     if $cross